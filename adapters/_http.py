@@ -0,0 +1,35 @@
+import atexit
+import threading
+from typing import Dict, Mapping, Optional, Tuple
+import httpx
+
+# One client per process for the plain JSON adapters (lever, greenhouse, ...):
+# keep-alive and TLS sessions carry over between companies, and httpx.Client is
+# safe to share across main's worker threads. Built on first use, one per
+# distinct header/redirect setup, and closed at exit.
+DEFAULT_HEADERS: Mapping[str, str] = {"User-Agent": "job-scout/1.0"}
+
+_LOCK = threading.Lock()
+_CLIENTS: Dict[Tuple, httpx.Client] = {}
+
+def client(headers: Optional[Mapping[str, str]] = None, follow_redirects: bool = False) -> httpx.Client:
+    headers = DEFAULT_HEADERS if headers is None else headers
+    key = (tuple(sorted(headers.items())), follow_redirects)
+    c = _CLIENTS.get(key)
+    if c is None:
+        with _LOCK:
+            c = _CLIENTS.get(key)
+            if c is None:
+                c = _CLIENTS[key] = httpx.Client(headers=dict(headers), timeout=30,
+                                                 follow_redirects=follow_redirects)
+    return c
+
+@atexit.register
+def _close():
+    with _LOCK:
+        for c in _CLIENTS.values():
+            try:
+                c.close()
+            except Exception:
+                pass
+        _CLIENTS.clear()
@@ -1,11 +1,12 @@
 import datetime as dt
-import httpx
+import orjson
 from tenacity import retry, wait_exponential, stop_after_attempt
 
+from adapters import _http
+
 @retry(wait=wait_exponential(min=1, max=30), stop=stop_after_attempt(5))
 def _get(url, timeout=30):
-    with httpx.Client(timeout=timeout, headers={"User-Agent": "job-scout/1.0"}) as c:
-        return c.get(url)
+    return _http.client().get(url, timeout=timeout)
 
 def _try_endpoints(slug):
     yield f"https://{slug}.ashbyhq.com/api/public/jobs"
@@ -72,7 +73,7 @@ def fetch(company):
                 r = _get(url); r.raise_for_status()
                 if "json" not in (r.headers.get("Content-Type","").lower()):
                     return []
-                data = r.json()
+                data = orjson.loads(r.content)
                 break
             except Exception:
                 continue
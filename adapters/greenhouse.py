@@ -1,10 +1,11 @@
-import httpx
+import orjson
 from tenacity import retry, wait_exponential, stop_after_attempt
 
+from adapters import _http
+
 @retry(wait=wait_exponential(min=1, max=30), stop=stop_after_attempt(5))
 def _get(url, timeout=30):
-    with httpx.Client(timeout=timeout, headers={"User-Agent":"job-scout/1.0"}) as c:
-        return c.get(url)
+    return _http.client().get(url, timeout=timeout)
 
 def fetch(company):
     slug = company["slug"]
@@ -12,7 +13,7 @@ def fetch(company):
     jurl = f"https://boards-api.greenhouse.io/v1/boards/{slug}/jobs"
     r = _get(jurl)
     r.raise_for_status()
-    data = r.json() or {}
+    data = orjson.loads(r.content) or {}
     items = data.get("jobs", [])
     jobs=[]
     for x in items:
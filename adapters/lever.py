@@ -1,18 +1,19 @@
 import datetime as dt
-import httpx
+import orjson
 from tenacity import retry, wait_exponential, stop_after_attempt
 
+from adapters import _http
+
 @retry(wait=wait_exponential(min=1, max=30), stop=stop_after_attempt(5))
 def _get(url, timeout=30):
-    with httpx.Client(timeout=timeout, headers={"User-Agent":"job-scout/1.0"}) as c:
-        return c.get(url)
+    return _http.client().get(url, timeout=timeout)
 
 def fetch(company):
     slug = company["slug"]
     url = f"https://api.lever.co/v0/postings/{slug}?mode=json"
     r = _get(url)
     r.raise_for_status()
-    data = r.json()
+    data = orjson.loads(r.content)
     jobs=[]
     for x in data:
         cats = x.get("categories") or {}
@@ -1,6 +1,9 @@
-import os, json, httpx, re
+import os, re
+import orjson
 from tenacity import retry, wait_exponential, stop_after_attempt
 
+from adapters import _http
+
 BASE = "https://api.smartrecruiters.com/v1/companies/{slug}/postings"
 
 HEADERS = {
@@ -28,8 +31,7 @@ ITALY_CITY_TOKENS = [
 
 @retry(wait=wait_exponential(min=1, max=30), stop=stop_after_attempt(5))
 def _get(url, params=None, timeout=30):
-    with httpx.Client(headers=HEADERS, timeout=timeout, follow_redirects=True) as c:
-        return c.get(url, params=params or {})
+    return _http.client(HEADERS, follow_redirects=True).get(url, params=params or {}, timeout=timeout)
 
 def _val(v):
     if v is None: return ""
@@ -157,7 +159,7 @@ def fetch(company):
             if r.status_code != 200 or "json" not in ct:
                 attempts.append({"slug": slug, "status": r.status_code, "json": ("json" in ct), "items": 0})
                 break
-            data = r.json() or {}
+            data = orjson.loads(r.content) or {}
             items = data.get("content") or data.get("postings") or []
             if not isinstance(items, list) or not items:
                 attempts.append({"slug": slug, "status": r.status_code, "json": True, "items": 0})
@@ -228,7 +230,7 @@ def fetch(company):
             raw_items.extend(out)
 
         if debug:
-            print(f"SMART_RAW {company['name']}: {json.dumps(raw_summary)} total_raw={total}")
+            print(f"SMART_RAW {company['name']}: {orjson.dumps(raw_summary).decode()} total_raw={total}")
 
         if raw_items and (allowed_country_tokens or allowed_cities):
             # Build text tokens from country names + Italy cities
@@ -246,6 +248,6 @@ def fetch(company):
             results = [j for j in raw_items if _hits(j)]
 
     if debug:
-        print(f"SMART_DEBUG {company['name']}: {json.dumps(attempts)[:1800]} got={len(results)}")
+        print(f"SMART_DEBUG {company['name']}: {orjson.dumps(attempts).decode()[:1800]} got={len(results)}")
 
     return results
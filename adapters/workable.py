@@ -1,12 +1,12 @@
 import datetime as dt
-import httpx
+import orjson
 from tenacity import retry, wait_exponential, stop_after_attempt
 
+from adapters import _http
+
 @retry(wait=wait_exponential(min=1, max=30), stop=stop_after_attempt(5))
 def _get(url, timeout=30):
-    headers = {"User-Agent": "job-scout/1.0"}
-    with httpx.Client(timeout=timeout, headers=headers) as c:
-        return c.get(url)
+    return _http.client().get(url, timeout=timeout)
 
 def _build_url(slug, job):
     # Prefer direct URL if provided; else construct from shortcode
@@ -33,7 +33,7 @@ def fetch(company):
     base = f"https://apply.workable.com/api/v3/accounts/{slug}/jobs?limit=200"
     r = _get(base)
     r.raise_for_status()
-    data = r.json() or {}
+    data = orjson.loads(r.content) or {}
     items = data.get("results") or data.get("jobs") or []
     jobs = []
     for x in items:
@@ -1,10 +1,19 @@
 import os
-import json
 import uuid
 import time
-from typing import Dict, List, Any
+import asyncio
+import functools
+import weakref
+from types import MappingProxyType
+from urllib.parse import urlsplit
+from typing import Dict, List, Any, Mapping, Optional, Set, Tuple
 import httpx
-from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type
+import orjson
+
+try:
+    import uvloop  # optional, libuv-backed loop for the probe fan-out (not on Windows)
+except ImportError:
+    uvloop = None
 
 # We will probe:
 #   A) https://{host}/wday/cxs/{tenant}/{site}/jobs
@@ -33,9 +42,14 @@ WD_MAX_SITES    = _env_int("WD_MAX_SITES",  8)
 WD_MAX_PAGES    = _env_int("WD_MAX_PAGES",  1)
 WD_EARLY_BREAK  = _env_flag("WD_EARLY_BREAK", True)
 WD_LOCALES      = _env_list("WD_LOCALES", ["none","en-US","en_GB","locale:en_US","locale:en-GB"])
+WD_CONCURRENCY  = _env_int("WD_CONCURRENCY", 8)
+WD_GLOBAL_CONCURRENCY = _env_int("WD_GLOBAL_CONCURRENCY", 64)
+WD_HOST_CACHE_TTL = _env_int("WD_HOST_CACHE_TTL", 3600)
+WD_WAVE_PAIRS   = _env_int("WD_WAVE_PAIRS", 2)  # fallback (host, site) pairs probed together
 LIMIT           = 200
+RETRIES         = 3
 TIMEOUT_SECS    = 18.0
-PAUSE_BETWEEN   = 0.6  # small politeness delay to avoid 429s
+LOCALE_STAGGER  = 0.02 # spacing between concurrent locale variants of one probe
 
 DEFAULT_SITES = [
     "External","Global","Careers","Jobs","Job","JobBoard",
@@ -45,120 +59,165 @@ DEFAULT_SITES = [
 ]
 
 # A more complete, browser-like header set. These matter on many Workday edges.
-def _host_headers(host: str, site: str) -> Dict[str,str]:
-    return {
-        "Accept": "application/json, text/plain, */*",
-        "Accept-Language": "en-US,en;q=0.8",
-        "Cache-Control": "no-cache",
-        "Pragma": "no-cache",
+# Sent on the CXS JSON calls only (see _host_headers); the client itself just
+# carries the UA and language, so the warmup navigation doesn't look like XHR.
+BASE_HEADERS: Mapping[str,str] = MappingProxyType({
+    "Accept": "application/json, text/plain, */*",
+    "Accept-Language": "en-US,en;q=0.8",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+    "User-Agent": ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"),
+    # These increase acceptance on some tenants:
+    "X-Requested-With": "XMLHttpRequest",
+    "X-Workday-Client": "browser",     # harmless hint used by UI
+    "Sec-Fetch-Site": "same-site",
+    "Sec-Fetch-Mode": "cors",
+    "Sec-Fetch-Dest": "empty",
+    # Sec-CH hints – some edges branch on these:
+    "Sec-CH-UA": '"Chromium";v="124", "Not:A-Brand";v="99"',
+    "Sec-CH-UA-Mobile": "?0",
+    "Sec-CH-UA-Platform": '"Linux"',
+})
+CLIENT_HEADERS: Mapping[str,str] = MappingProxyType({k: BASE_HEADERS[k] for k in ("User-Agent", "Accept-Language")})
+
+# What a browser sends when it loads the site page itself.
+NAV_HEADERS: Mapping[str,str] = MappingProxyType({
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Upgrade-Insecure-Requests": "1",
+    "Sec-Fetch-Site": "none",
+    "Sec-Fetch-Mode": "navigate",
+    "Sec-Fetch-User": "?1",
+    "Sec-Fetch-Dest": "document",
+})
+
+# Full CXS header set per (host, site), built once; httpx adds the client's UA/language.
+@functools.lru_cache(maxsize=None)
+def _host_headers(host: str, site: str) -> Mapping[str,str]:
+    return MappingProxyType({
+        **BASE_HEADERS,
         "Origin": f"https://{host}",
         "Referer": f"https://{host}/{site}",
-        "User-Agent": ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-                       "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"),
-        # These increase acceptance on some tenants:
-        "X-Requested-With": "XMLHttpRequest",
-        "X-Workday-Client": "browser",     # harmless hint used by UI
         "X-Workday-Request-Id": str(uuid.uuid4()),
-        "Sec-Fetch-Site": "same-site",
-        "Sec-Fetch-Mode": "cors",
-        "Sec-Fetch-Dest": "empty",
-        # Sec-CH hints – some edges branch on these:
-        "Sec-CH-UA": '"Chromium";v="124", "Not:A-Brand";v="99"',
-        "Sec-CH-UA-Mobile": "?0",
-        "Sec-CH-UA-Platform": '"Linux"',
-    }
+    })
 
 class HttpRetriableError(Exception): pass
 
-def _locale_params(token: str) -> Dict[str, Any]:
+@functools.lru_cache(maxsize=None)
+def _locale_params(token: str) -> Mapping[str, Any]:
     if token == "none":
-        return {"activeOnly": "true"}
+        return MappingProxyType({"activeOnly": "true"})
     if token.startswith("locale:"):
-        return {"activeOnly": "true", "locale": token.split(":",1)[1]}
+        return MappingProxyType({"activeOnly": "true", "locale": token.split(":",1)[1]})
     if token in ("en-US","en_GB"):
-        return {"activeOnly": "true", "lang": token}
-    return {"activeOnly": "true"}
+        return MappingProxyType({"activeOnly": "true", "lang": token})
+    return MappingProxyType({"activeOnly": "true"})
+
+@functools.lru_cache(maxsize=64)
+def _page_params(offset: int) -> Tuple[Dict[str, Any], ...]:
+    # One query dict per WD_LOCALES token for this offset, shared by every path/site.
+    # Treated as read-only by callers.
+    base = {"limit": LIMIT, "offset": offset}
+    return tuple({**base, **_locale_params(tok)} for tok in WD_LOCALES)
 
 def _norm(x: Any) -> str:
+    t = type(x)
+    if t is str: return x.strip()  # the overwhelmingly common case
     if x is None: return ""
-    if isinstance(x, (int,float)): return str(x)
+    if t is int or t is float: return str(x)
     return str(x).strip()
 
 def _join(parts: List[str], sep=", ") -> str:
     return sep.join([p for p in parts if p])
 
+_ITEM_KEYS = ("jobPostings","items","value","postings","data")
+
 def _parse_items(data: Any) -> List[Dict[str, Any]]:
-    if not isinstance(data, dict): return []
-    for k in ("jobPostings","items","value","postings","data"):
+    if type(data) is not dict: return []
+    for k in _ITEM_KEYS:
         v = data.get(k)
-        if isinstance(v, list) and v:
+        if type(v) is list and v:
             return v
-    body = data.get("body") or data.get("result")
-    if isinstance(body, dict):
-        for k in ("jobPostings","items","value","postings","data"):
-            v = body.get(k)
-            if isinstance(v, list) and v:
-                return v
+    for bk in ("body","result"):
+        body = data.get(bk)
+        if type(body) is dict:
+            for k in _ITEM_KEYS:
+                v = body.get(k)
+                if type(v) is list and v:
+                    return v
     return []
 
-def _extract_id(obj: Dict[str, Any]) -> str:
-    for k in ("id","jobPostingId","requisitionId","jobReqId","number"):
-        v = _norm(obj.get(k))
-        if v: return v
-    return ""
-
-def _extract_title(obj: Dict[str, Any]) -> str:
-    for k in ("title","jobPostingTitle","name","displayTitle","requisitionTitle"):
-        v = _norm(obj.get(k))
-        if v: return v
-    return ""
-
-def _extract_url(host: str, obj: Dict[str, Any]) -> str:
-    for k in ("externalUrl","applyUrl","url","externalPath"):
-        v = _norm(obj.get(k))
-        if v:
-            if v.startswith("/"):
-                return f"https://{host}{v}"
-            return v
+# Candidate keys per output field, highest priority first. Flattened into
+# FIELD_MAP (key -> (field, priority)) so _map_item walks each posting once.
+_FIELD_KEYS = {
+    "id":         ("id","jobPostingId","requisitionId","jobReqId","number"),
+    "title":      ("title","jobPostingTitle","name","displayTitle","requisitionTitle"),
+    "url":        ("externalUrl","applyUrl","url","externalPath"),
+    "snippet":    ("jobPostingDescription","jobDescription","description","summary"),
+    "department": ("department","jobFamily","category"),
+    "posted_at":  ("postedOn","startDate","postedDate"),
+}
+FIELD_MAP = {k: (field, prio) for field, keys in _FIELD_KEYS.items() for prio, k in enumerate(keys)}
+
+def _extract_fields(obj: Dict[str, Any]) -> Dict[str, str]:
+    best: Dict[str, str] = {}
+    rank: Dict[str, int] = {}
+    for k, v in obj.items():
+        slot = FIELD_MAP.get(k)
+        if slot is None: continue
+        field, prio = slot
+        if rank.get(field, prio + 1) <= prio: continue
+        if field == "snippet":
+            if isinstance(v, dict):
+                v = v.get("text") or v.get("html") or v.get("value")
+            if not isinstance(v, str) or not v: continue
+            v = v[:240]
+        else:
+            v = v.strip() if type(v) is str else _norm(v)
+            if not v: continue
+        best[field] = v
+        rank[field] = prio
+    return best
+
+def _extract_link(obj: Dict[str, Any]) -> str:
     links = obj.get("links")
     if isinstance(links, list):
         for ln in links:
             if isinstance(ln, dict):
                 href = _norm(ln.get("href"))
-                if href:
-                    if href.startswith("/"):
-                        return f"https://{host}{href}"
-                    return href
+                if href: return href
     return ""
 
-def _extract_snippet(obj: Dict[str, Any]) -> str:
-    for k in ("jobPostingDescription","jobDescription","description","summary"):
-        v = obj.get(k)
-        if isinstance(v, str): return v[:240]
-        if isinstance(v, dict):
-            t = v.get("text") or v.get("html") or v.get("value")
-            if isinstance(t, str): return t[:240]
-    return ""
+# Location sub-dict key -> (slot, priority); slots are city, region, country.
+_LOC_FIELDS = {
+    "city": (0, 0), "cityName": (0, 1), "cityText": (0, 2),
+    "region": (1, 0), "state": (1, 1), "province": (1, 2),
+    "country": (2, 0), "countryName": (2, 1), "countryCode": (2, 2),
+}
+_PRIMARY_LOC_FIELDS = {k: v for k, v in _LOC_FIELDS.items() if k not in ("cityText", "province")}
+
+def _loc_parts(l: Dict[str, Any], fields: Dict[str, Tuple[int, int]]) -> str:
+    slot = ["", "", ""]
+    rank = [3, 3, 3]
+    for k, v in l.items():
+        f = fields.get(k)
+        if f is None or not v: continue
+        i, p = f
+        if p < rank[i]:
+            slot[i] = v.strip() if type(v) is str else _norm(v)
+            rank[i] = p
+    return _join(slot)
 
 def _extract_location(obj: Dict[str, Any]) -> str:
     locs = obj.get("locations")
     if isinstance(locs, list) and locs:
-        out = []
-        for l in locs:
-            if not isinstance(l, dict): continue
-            city = _norm(l.get("city") or l.get("cityName") or l.get("cityText"))
-            region = _norm(l.get("region") or l.get("state") or l.get("province"))
-            country = _norm(l.get("country") or l.get("countryName") or l.get("countryCode"))
-            out.append(_join([city, region, country]))
+        out = [_loc_parts(l, _LOC_FIELDS) for l in locs if isinstance(l, dict)]
         if out:
             return "; ".join([p for p in out if p])
 
     loc = obj.get("location") or obj.get("primaryLocation")
     if isinstance(loc, dict):
-        city = _norm(loc.get("city") or loc.get("cityName"))
-        region = _norm(loc.get("region") or loc.get("state"))
-        country = _norm(loc.get("country") or loc.get("countryName") or loc.get("countryCode"))
-        s = _join([city, region, country])
+        s = _loc_parts(loc, _PRIMARY_LOC_FIELDS)
         if s: return s
         label = _norm(loc.get("label") or loc.get("name") or loc.get("displayName"))
         if label: return label
@@ -170,64 +229,129 @@ def _extract_location(obj: Dict[str, Any]) -> str:
         if v: return v
     return ""
 
-@retry(wait=wait_exponential(min=1, max=8), stop=stop_after_attempt(3),
-       retry=retry_if_exception_type(HttpRetriableError))
-def _get(client: httpx.Client, url: str, params: Dict[str, Any], headers: Dict[str,str]) -> httpx.Response:
-    r = client.get(url, params=params, headers=headers)
-    # Workday rate-limits hard (429) and sometimes replies 5xx on bad cookie/header mixes.
-    if r.status_code == 429 or (500 <= r.status_code < 600):
-        raise HttpRetriableError(f"{r.status_code} for {url}")
-    return r
+# host -> time.monotonic() before which we hold off, from a 429's Retry-After
+_BACKOFF: Dict[str, float] = {}
 
-def _site_candidates(company: Dict[str, Any]) -> List[str]:
+def _retry_after(r: httpx.Response) -> float:
+    try:
+        return float(r.headers.get("Retry-After") or 0)
+    except ValueError:
+        return 0.0  # HTTP-date form; the exponential backoff covers it
+
+async def _get(client: httpx.AsyncClient, sem: asyncio.Semaphore, url: str,
+               params: Dict[str, Any], headers: Mapping[str,str]) -> httpx.Response:
+    """
+    Returns an open streamed response: only headers have been read, the caller
+    must aread() or aclose() it. Plain retry loop (no tenacity); the slot is only
+    held while a request is in flight.
+    """
+    host = url.split("/", 3)[2]
+    for i in range(RETRIES):
+        # Only wait when the server has asked us to; no fixed pause between pages.
+        remaining = _BACKOFF.get(host, 0.0) - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        async with sem:
+            r = await client.send(client.build_request("GET", url, params=params, headers=headers), stream=True)
+        # Workday rate-limits hard (429) and sometimes replies 5xx on bad cookie/header mixes.
+        if r.status_code != 429 and not (500 <= r.status_code < 600):
+            return r
+        if r.status_code == 429:
+            ra = _retry_after(r)
+            if ra > 0:
+                _BACKOFF[host] = time.monotonic() + ra
+        await r.aclose()
+        if i + 1 < RETRIES:
+            await asyncio.sleep(min(8, 2 ** i))
+    raise HttpRetriableError(f"{r.status_code} for {url}")
+
+def _str_tuple(v: Any) -> Tuple[str, ...]:
+    if isinstance(v, list):
+        return tuple(s.strip() for s in v if isinstance(s, str) and s.strip())
+    return ()
+
+# The candidate lists are pure functions of a few company fields, so they are
+# cached on a tuple of exactly those fields (fetch_many plans every company).
+@functools.lru_cache(maxsize=256)
+def _sites_for(name: str, user_sites: Tuple[str, ...]) -> Tuple[str, ...]:
     sites: List[str] = []
-    user_sites = company.get("workday_sites") or company.get("sites")
-    if isinstance(user_sites, list) and user_sites:
-        for s in user_sites:
-            if isinstance(s, str) and s.strip():
-                sites.append(s.strip())
+    seen: Set[str] = set()
+    def add(s: str):
+        if s not in seen:
+            seen.add(s); sites.append(s)
+
+    for s in user_sites:
+        add(s)
 
     # Expand if UMG/WMG by name
-    name = (company.get("name") or "").lower()
     if "universal" in name or "umg" in name:
         for s in ("UMGUS","UMGUK","universal-music-group","UNIVERSAL-MUSIC-GROUP"):
-            if s not in sites: sites.append(s)
+            add(s)
     if "warner" in name or "wmg" in name:
         for s in ("WMGUS","WMGGLOBAL","WMG","Wmg"):
-            if s not in sites: sites.append(s)
+            add(s)
 
     for s in DEFAULT_SITES:
-        if s not in sites:
-            sites.append(s)
-    return sites[:WD_MAX_SITES]
+        add(s)
+    return tuple(sites[:WD_MAX_SITES])
 
-def _hosts(company: Dict[str, Any]) -> List[str]:
+def _site_candidates(company: Dict[str, Any]) -> List[str]:
+    name = (company.get("name") or "").lower()
+    return list(_sites_for(name, _str_tuple(company.get("workday_sites") or company.get("sites"))))
+
+@functools.lru_cache(maxsize=256)
+def _hosts_for(tenant: str, user_hosts: Tuple[str, ...], host: str) -> Tuple[str, ...]:
     out: List[str] = []
-    hosts = company.get("workday_hosts")
-    if isinstance(hosts, list) and hosts:
-        out.extend([h.strip() for h in hosts if isinstance(h, str) and h.strip()])
+    seen: Set[str] = set()
+    def add(h: str):
+        if h not in seen:
+            seen.add(h); out.append(h)
 
-    host = company.get("workday_host")
-    if isinstance(host, str) and host.strip() and host.strip() not in out:
-        out.append(host.strip())
+    for h in user_hosts:
+        add(h)
+    if host:
+        add(host)
 
-    tenant = (company.get("workday_tenant") or "").strip().lower()
     if tenant:
         # Common shards
         for shard in ("wd1","wd2","wd3","wd5","wd6"):
-            guess = f"{tenant}.{shard}.myworkdayjobs.com"
-            if guess not in out:
-                out.append(guess)
+            add(f"{tenant}.{shard}.myworkdayjobs.com")
 
     if not out:
         out.append("myworkdayjobs.com")
-    return out[:WD_MAX_HOSTS]
+    return tuple(out)
+
+def _hosts(company: Dict[str, Any]) -> List[str]:
+    tenant = (company.get("workday_tenant") or "").strip().lower()
+    host = company.get("workday_host")
+    host = host.strip() if isinstance(host, str) else ""
+    hosts = _hosts_for(tenant, _str_tuple(company.get("workday_hosts")), host)
+
+    # A host that recently returned items for this tenant goes first. Kept out
+    # of the cached part since it changes as probes succeed.
+    good = _good_host(tenant)
+    if good:
+        return [good, *(h for h in hosts if h != good)][:WD_MAX_HOSTS]
+    return list(hosts[:WD_MAX_HOSTS])
+
+# tenant (lowercased) -> (host that last returned items, time.monotonic() of that success)
+_GOOD_HOST: Dict[str, Tuple[str, float]] = {}
+
+def _good_host(tenant: str) -> Optional[str]:
+    hit = _GOOD_HOST.get(tenant)
+    if hit and time.monotonic() - hit[1] < WD_HOST_CACHE_TTL:
+        return hit[0]
+    return None
+
+def _remember_host(tenant: str, host: str):
+    _GOOD_HOST[tenant.lower()] = (host, time.monotonic())
 
 def _paths(tenant: str, site: str) -> List[str]:
     return [f"/wday/cxs/{tenant}/{site}/jobs", f"/wday/cxs/{tenant}/jobs"]
 
-def _warmup(client: httpx.Client, host: str, site: str):
-    # Warm cookies on the exact host + site context
+async def _warm(client: httpx.AsyncClient, sem: asyncio.Semaphore, host: str, site: str):
+    # Warm cookies on the exact host + site context; each GET is awaited, so
+    # the cookies are in the jar as soon as it returns (no settle delay needed)
     warm = [
         f"https://{host}/{site}",
         f"https://{host}/wday/authenticate",
@@ -235,119 +359,297 @@ def _warmup(client: httpx.Client, host: str, site: str):
     ]
     for u in warm:
         try:
-            client.get(u, headers={"User-Agent": _host_headers(host, site)["User-Agent"]}, follow_redirects=True)
+            async with sem:
+                await client.get(u, headers=NAV_HEADERS, follow_redirects=True)
         except Exception:
             pass
-        time.sleep(0.2)
+
+# One warmup task per (host, site) on each client, shared by every path probe of
+# that site; entries go away with the client.
+_WARMED: "weakref.WeakKeyDictionary[httpx.AsyncClient, Dict[Tuple[str, str], asyncio.Future]]" = weakref.WeakKeyDictionary()
+
+async def _warmup(client: httpx.AsyncClient, sem: asyncio.Semaphore, host: str, site: str):
+    warmed = _WARMED.setdefault(client, {})
+    task = warmed.get((host, site))
+    if task is None:
+        task = warmed[(host, site)] = asyncio.ensure_future(_warm(client, sem, host, site))
+    # Shielded so a cancelled probe doesn't cancel the warmup its siblings are waiting on.
+    await asyncio.shield(task)
 
 def _map_item(host: str, company: Dict[str, Any], itm: Dict[str, Any]) -> Dict[str, Any]:
+    f = _extract_fields(itm)
+    url = f.get("url") or _extract_link(itm)
+    if url.startswith("/"):
+        url = f"https://{host}{url}"
     return {
         "source": "workday",
         "company": company.get("name"),
-        "id": _extract_id(itm) or None,
-        "title": _extract_title(itm),
+        "id": f.get("id") or None,
+        "title": f.get("title", ""),
         "location": _extract_location(itm),
         "remote": False,
-        "department": _norm(itm.get("department") or itm.get("jobFamily") or itm.get("category")),
+        "department": f.get("department", ""),
         "team": None,
-        "url": _extract_url(host, itm) or None,
-        "posted_at": _norm(itm.get("postedOn") or itm.get("startDate") or itm.get("postedDate")) or None,
-        "description_snippet": _extract_snippet(itm),
+        "url": url or None,
+        "posted_at": f.get("posted_at") or None,
+        "description_snippet": f.get("snippet", ""),
     }
 
-def fetch(company: Dict[str, Any]) -> List[Dict[str, Any]]:
-    if (company.get("ats") or "").lower() != "workday":
+async def _try_locale(client: httpx.AsyncClient, sem: asyncio.Semaphore, url: str,
+                      params: Dict[str, Any], hh: Mapping[str,str], delay: float,
+                      attempts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    if delay:
+        await asyncio.sleep(delay)
+    try:
+        r = await _get(client, sem, url, params, hh)
+    except HttpRetriableError:
+        if WORKDAY_DEBUG: attempts.append({"u": url, "p": params, "s": "5xx/429", "items": 0})
+        return []
+    except (httpx.HTTPError, OSError) as e:
+        if WORKDAY_DEBUG: attempts.append({"u": url, "p": params, "s": "error", "err": str(e), "items": 0})
         return []
 
-    attempts: List[Dict[str, Any]] = []
-    out: List[Dict[str, Any]] = []
+    try:
+        ct = (r.headers.get("Content-Type") or "").lower()
+        status = r.status_code
 
-    tenant = (company.get("workday_tenant") or "").strip()
-    if not tenant:
+        if status != 200 or "json" not in ct:
+            # Log the real status to understand blocks vs empties; the body is never downloaded.
+            if WORKDAY_DEBUG: attempts.append({"u": url, "p": params, "s": status, "ct": ct, "items": 0})
+            return []
+
+        try:
+            body = await r.aread()
+        except (httpx.HTTPError, OSError) as e:
+            if WORKDAY_DEBUG: attempts.append({"u": url, "p": params, "s": "error", "err": str(e), "items": 0})
+            return []
+    finally:
+        await r.aclose()
+
+    try:
+        data = orjson.loads(body)
+    except orjson.JSONDecodeError as e:
+        if WORKDAY_DEBUG: attempts.append({"u": url, "p": params, "s": "bad-json", "err": str(e), "items": 0})
         return []
 
+    items = _parse_items(data)
+    if WORKDAY_DEBUG: attempts.append({"u": url, "p": params, "s": status, "ct": ct, "items": len(items)})
+    return items
+
+# host -> index (into _page_params) of the locale variant that last returned items;
+# CXS query handling is tenant-wide, so it holds for every site and path on the host.
+_GOOD_LOCALE: Dict[str, int] = {}
+
+async def _probe_locales(client: httpx.AsyncClient, sem: asyncio.Semaphore, url: str, host: str,
+                         hh: Mapping[str,str], offset: int,
+                         attempts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    variants = _page_params(offset)
+    good = _GOOD_LOCALE.get(host)
+    if good is not None and good < len(variants):
+        items = await _try_locale(client, sem, url, variants[good], hh, 0, attempts)
+        if items:
+            return items
+
+    # The other locale variants go out together (lightly staggered to avoid a 429
+    # burst); the first non-empty page wins and the rest are cancelled.
+    async def run(i: int, delay: float):
+        return i, await _try_locale(client, sem, url, variants[i], hh, delay, attempts)
+
+    order = [i for i in range(len(variants)) if i != good]
+    tasks = [asyncio.create_task(run(i, k * LOCALE_STAGGER)) for k, i in enumerate(order)]
+    try:
+        for fut in asyncio.as_completed(tasks):
+            i, items = await fut
+            if items:
+                _GOOD_LOCALE[host] = i
+                return items
+        return []
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+async def _probe_path(client: httpx.AsyncClient, sem: asyncio.Semaphore, company: Dict[str, Any],
+                      host: str, site: str, path: str, attempts: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    await _warmup(client, sem, host, site)
+    hh = _host_headers(host, site)
+    url = f"https://{host}{path}"
+    out: List[Dict[str, Any]] = []
+    offset = 0
+    pages_done = 0
+    while pages_done < WD_MAX_PAGES:
+        items = await _probe_locales(client, sem, url, host, hh, offset, attempts)
+        mapped = [_map_item(host, company, itm) for itm in items if isinstance(itm, dict)]
+        if not mapped:
+            break
+        out.extend(mapped)
+        if WD_EARLY_BREAK:
+            break  # first page of the winning candidate is enough
+        pages_done += 1
+        if len(mapped) < LIMIT:
+            break
+        offset += LIMIT
+    return out
+
+def _waves(company: Dict[str, Any], tenant: str, hosts: List[str], sites: List[str]) -> List[List[Tuple[str, str]]]:
+    """
+    (host, site) pairs in priority order, grouped into the waves they are probed in:
+    the configured (or recently good) hosts x configured sites first, then the
+    guessed fallbacks WD_WAVE_PAIRS at a time.
+    """
+    host = company.get("workday_host")
+    known = {_good_host(tenant.lower()), host.strip() if isinstance(host, str) else None,
+             *_str_tuple(company.get("workday_hosts"))}
+    user_sites = set(_str_tuple(company.get("workday_sites") or company.get("sites")))
+    first_hosts = [h for h in hosts if h in known] or hosts[:1]
+    first_sites = [s for s in sites if s in user_sites] or sites[:1]
+    first = [(h, s) for h in first_hosts for s in first_sites]
+    taken = set(first)
+    rest = [(h, s) for h in hosts for s in sites if (h, s) not in taken]
+    step = max(1, WD_WAVE_PAIRS)
+    return [first] + [rest[i:i + step] for i in range(0, len(rest), step)]
+
+async def _run_wave(probes: List[Tuple[int, Any]]) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    Runs one wave's probes together; returns {priority index: items} for those
+    that found jobs. Under WD_EARLY_BREAK a hit cancels only the lower-priority
+    probes still running, so the result doesn't depend on who answers first.
+    Expected request failures are already absorbed in _try_locale; anything a
+    probe raises past that is re-raised (and the rest of the wave cancelled).
+    """
+    index = {asyncio.ensure_future(p): i for i, p in probes}
+    got: Dict[int, List[Dict[str, Any]]] = {}
+    pending = set(index)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                if t.cancelled():
+                    continue
+                if t.exception() is not None:
+                    raise t.exception()
+                if t.result():
+                    got[index[t]] = t.result()
+            if WD_EARLY_BREAK and got:
+                best = min(got)
+                for t in [t for t in pending if index[t] > best]:
+                    t.cancel()
+                    pending.discard(t)
+    finally:
+        for t in pending:
+            t.cancel()
+        await asyncio.gather(*index, return_exceptions=True)
+    return got
+
+def new_client(max_connections: int = 32) -> httpx.AsyncClient:
+    # HTTP/2 multiplexes warmups and probes over one TLS connection per host, so
+    # max_connections only needs to cover roughly WD_MAX_HOSTS per company.
+    limits = httpx.Limits(max_connections=max_connections,
+                          max_keepalive_connections=max_connections // 2, keepalive_expiry=30)
+    return httpx.AsyncClient(http2=True, headers=CLIENT_HEADERS, timeout=TIMEOUT_SECS,
+                             follow_redirects=True, limits=limits)
+
+def _dedupe(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Tenants list the same posting on several shards (wd1/wd5) and sites; the
+    # requisition id (or, failing that, the URL path) is the same on all of them.
+    seen: Set[str] = set()
+    out: List[Dict[str, Any]] = []
+    for j in jobs:
+        key = j.get("id") or urlsplit(j.get("url") or "").path
+        if key:
+            if key in seen:
+                continue
+            seen.add(key)
+        out.append(j)
+    return out
+
+async def _fetch_with(client: httpx.AsyncClient, company: Dict[str, Any],
+                      sem: Optional[asyncio.Semaphore] = None) -> List[Dict[str, Any]]:
+    attempts: List[Dict[str, Any]] = []  # only filled when WORKDAY_DEBUG is on
+    out: List[Dict[str, Any]] = []
+
+    tenant = (company.get("workday_tenant") or "").strip()
     hosts = _hosts(company)
     sites  = _site_candidates(company)
 
-    # Session per company
-    with httpx.Client(timeout=TIMEOUT_SECS, follow_redirects=True) as client:
-        for host in hosts:
-            # Scope cookie to exact host (helps some edges)
-            try:
-                client.cookies.set("wd-browser-id", str(uuid.uuid4()), domain=host)
-            except Exception:
-                client.cookies.set("wd-browser-id", str(uuid.uuid4()))
-
-            for site in sites:
-                _warmup(client, host, site)
-                hh = _host_headers(host, site)
-
-                for path in _paths(tenant, site):
-                    offset = 0
-                    pages_done = 0
-                    while pages_done < WD_MAX_PAGES:
-                        got_this_page = 0
-
-                        for tok in WD_LOCALES:
-                            params = {"limit": LIMIT, "offset": offset}
-                            params.update(_locale_params(tok))
-                            url = f"https://{host}{path}"
-
-                            try:
-                                r = _get(client, url, params, hh)
-                            except HttpRetriableError as _:
-                                attempts.append({"u": url, "p": params, "s": "5xx/429", "items": 0})
-                                continue
-                            except Exception as e:
-                                attempts.append({"u": url, "p": params, "s": "error", "err": str(e), "items": 0})
-                                continue
-
-                            ct = (r.headers.get("Content-Type") or "").lower()
-                            status = r.status_code
-
-                            if status != 200 or "json" not in ct:
-                                # Log the real status to understand blocks vs empties
-                                attempts.append({"u": url, "p": params, "s": status, "ct": ct, "items": 0})
-                                continue
-
-                            try:
-                                data = r.json()
-                            except Exception as e:
-                                attempts.append({"u": url, "p": params, "s": "bad-json", "err": str(e), "items": 0})
-                                continue
-
-                            items = _parse_items(data)
-                            if not items:
-                                attempts.append({"u": url, "p": params, "s": status, "ct": ct, "items": 0})
-                                continue
-
-                            mapped = [_map_item(host, company, itm) for itm in items if isinstance(itm, dict)]
-                            out.extend(mapped)
-                            got_this_page = len(mapped)
-                            attempts.append({"u": url, "p": params, "s": status, "ct": ct, "items": got_this_page})
-
-                            if WD_EARLY_BREAK and got_this_page > 0:
-                                if WORKDAY_DEBUG:
-                                    attempts_str = json.dumps(attempts)[:2000]
-                                    print(f"WORKDAY_DEBUG {company.get('name')}: tried={attempts_str} got={len(out)}")
-                                return out
-
-                            break  # after a success attempt (or last failure) move on
-
-                        if got_this_page == 0:
-                            break  # try next PATH or SITE
-
-                        pages_done += 1
-                        if got_this_page < LIMIT:
-                            break
-                        offset += LIMIT
-
-                        time.sleep(PAUSE_BETWEEN)
-
-                time.sleep(PAUSE_BETWEEN)
+    for host in hosts:
+        # Scope cookie to exact host (helps some edges)
+        try:
+            client.cookies.set("wd-browser-id", str(uuid.uuid4()), domain=host)
+        except Exception:
+            client.cookies.set("wd-browser-id", str(uuid.uuid4()))
+
+    # Ordered waves, highest priority first: a wave (and its warmups) only goes
+    # out if the ones before it found nothing, or early break is off. Results are
+    # kept in priority order either way, as in a sequential walk.
+    if sem is None:
+        sem = asyncio.Semaphore(WD_CONCURRENCY)
+    for wave in _waves(company, tenant, hosts, sites):
+        cands = [(host, site, path) for host, site in wave for path in _paths(tenant, site)]
+        got = await _run_wave([(i, _probe_path(client, sem, company, h, s, p, attempts))
+                               for i, (h, s, p) in enumerate(cands)])
+        if got and not out:
+            _remember_host(tenant, cands[min(got)][0])  # the best hit, not the last one
+        for i in sorted(got):
+            out.extend(got[i])
+            if WD_EARLY_BREAK:
+                break
+        if WD_EARLY_BREAK and got:
+            break
+
+    out = _dedupe(out)
 
     if WORKDAY_DEBUG:
-        attempts_str = json.dumps(attempts)[:2000]
+        attempts_str = orjson.dumps(attempts).decode()[:2000]
         print(f"WORKDAY_DEBUG {company.get('name')}: tried={attempts_str} got={len(out)}")
 
     return out
+
+async def fetch_async(company: Dict[str, Any], client: Optional[httpx.AsyncClient] = None,
+                      sem: Optional[asyncio.Semaphore] = None) -> List[Dict[str, Any]]:
+    """
+    Async entry point. Pass a client from new_client() (it carries the UA/language)
+    to share its connection pool and cookie jar across companies (cookies stay
+    scoped per host).
+    """
+    if (company.get("ats") or "").lower() != "workday":
+        return []
+    if not (company.get("workday_tenant") or "").strip():
+        return []
+
+    if client is not None:
+        return await _fetch_with(client, company, sem)
+    async with new_client() as own:
+        return await _fetch_with(own, company, sem)
+
+async def _fetch_one(client: httpx.AsyncClient, sem: asyncio.Semaphore,
+                     company: Dict[str, Any]) -> List[Dict[str, Any]]:
+    try:
+        return await fetch_async(company, client, sem)
+    except Exception as e:
+        print("ERROR", company.get("name"), e)
+        return []
+
+async def fetch_many(companies: List[Dict[str, Any]],
+                     global_concurrency: int = WD_GLOBAL_CONCURRENCY) -> List[List[Dict[str, Any]]]:
+    """
+    Fetch several companies on one event loop, one client and one global
+    semaphore. Returns one job list per company, in input order; a company
+    that fails yields [] instead of sinking the batch.
+    """
+    sem = asyncio.Semaphore(global_concurrency)
+    async with new_client(max_connections=global_concurrency) as client:
+        return await asyncio.gather(*[_fetch_one(client, sem, co) for co in companies])
+
+def _run(coro):
+    # uvloop.run() only swaps the loop for this call; no global policy change
+    # leaks into other adapters.
+    if uvloop is not None:
+        return uvloop.run(coro)
+    return asyncio.run(coro)
+
+def fetch_many_sync(companies: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+    return _run(fetch_many(companies))
+
+def fetch(company: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return _run(fetch_async(company))
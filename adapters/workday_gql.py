@@ -1,10 +1,23 @@
 import os
-import json
 import uuid
+import random
 import time
-from typing import Dict, List, Any
+import asyncio
+import atexit
+import functools
+import threading
+import weakref
+from dataclasses import dataclass
+from types import MappingProxyType
+from urllib.parse import urlsplit
+from typing import Dict, List, Any, Mapping, Optional, Set, Tuple
 import httpx
-from tenacity import retry, wait_exponential, stop_after_attempt, retry_if_exception_type
+import orjson
+
+try:
+    import ijson  # optional: incremental parsing for very large pages
+except ImportError:
+    ijson = None
 
 def _env_flag(name: str, default: bool = False) -> bool:
     v = os.getenv(name, "")
@@ -29,8 +42,9 @@ WD_MAX_SITES    = _env_int("WD_MAX_SITES",   6)
 WD_MAX_PAGES    = _env_int("WD_MAX_PAGES",   2)
 WD_EARLY_BREAK  = _env_flag("WD_EARLY_BREAK", True)
 LIMIT           = _env_int("WD_LIMIT",  200)
+WD_STREAM_MIN_BYTES = _env_int("WD_STREAM_MIN_BYTES", 256_000)
 TIMEOUT_SECS    = 20.0
-PAUSE_BETWEEN   = 0.5
+RETRIES         = 3
 
 DEFAULT_SITES = [
     "External","Global","Careers","Jobs","Job","JobBoard",
@@ -38,10 +52,8 @@ DEFAULT_SITES = [
     "WMGUS","WMGGLOBAL","WMG","Wmg",
 ]
 
-# Workday public job board GraphQL payload (as used by myworkdayjobs UI)
-GQL_QUERY = """
-query SearchJobs($limit: Int!, $offset: Int!, $appliedFacets: AppliedFacetsInput, $searchText: String) {
-  jobPostings(limit: $limit, offset: $offset, appliedFacets: $appliedFacets, searchText: $searchText) {
+# Selection set of one jobPostings page, shared by the plain and the page-aliased query
+_POSTING_FIELDS = """{
     totalCount
     edges {
       node {
@@ -62,214 +74,512 @@ query SearchJobs($limit: Int!, $offset: Int!, $appliedFacets: AppliedFacetsInput
         category
       }
     }
-  }
-}
+  }"""
+
+# Workday public job board GraphQL payload (as used by myworkdayjobs UI)
+GQL_QUERY = f"""
+query SearchJobs($limit: Int!, $offset: Int!, $appliedFacets: AppliedFacetsInput, $searchText: String) {{
+  jobPostings(limit: $limit, offset: $offset, appliedFacets: $appliedFacets, searchText: $searchText) {_POSTING_FIELDS}
+}}
 """.strip()
 
+def _payload(offset: int) -> Dict[str, Any]:
+    # Only `variables` changes per page; the query text is shared by reference.
+    return {
+        "operationName": "SearchJobs",
+        "variables": {
+            "limit": LIMIT,
+            "offset": offset,
+            "searchText": None,
+            "appliedFacets": {}  # fetch everything, we'll filter later
+        },
+        "query": GQL_QUERY
+    }
+
+@functools.lru_cache(maxsize=64)
+def _body(offset: int) -> bytes:
+    # Encoded once per offset and reused by every host/site that asks for that page.
+    return orjson.dumps(_payload(offset))
+
+@functools.lru_cache(maxsize=8)
+def _batch_body(pages: int) -> bytes:
+    # All pages of one board in a single document, aliased p0..pN with one
+    # offset variable each; Workday resolves them in one round trip.
+    offsets = ", ".join(f"$o{i}: Int!" for i in range(pages))
+    fields = "\n".join(
+        f"  p{i}: jobPostings(limit: $limit, offset: $o{i}, appliedFacets: $appliedFacets, searchText: $searchText) {_POSTING_FIELDS}"
+        for i in range(pages)
+    )
+    query = f"query SearchJobs($limit: Int!, {offsets}, $appliedFacets: AppliedFacetsInput, $searchText: String) {{\n{fields}\n}}"
+    variables = {"limit": LIMIT, "searchText": None, "appliedFacets": {}}
+    variables.update((f"o{i}", i * LIMIT) for i in range(pages))
+    return orjson.dumps({"operationName": "SearchJobs", "variables": variables, "query": query})
+
 def _norm(x: Any) -> str:
+    t = type(x)
+    if t is str: return x.strip()  # the common case for GraphQL payloads
     if x is None: return ""
-    if isinstance(x, (int,float)): return str(x)
+    if t is int or t is float: return str(x)
     return str(x).strip()
 
-def _join(parts: List[str], sep=", ") -> str:
-    return sep.join([p for p in parts if p])
+@functools.lru_cache(maxsize=256)
+def _hosts_for(tenant: str, user_hosts: Tuple[str, ...], host: str) -> Tuple[str, ...]:
+    # Ordered dict keys: update() skips what's already there without a list scan.
+    out: Dict[str, None] = dict.fromkeys(user_hosts)
+    if host:
+        out[host] = None
+    if tenant:
+        out.update(dict.fromkeys(f"{tenant}.{shard}.myworkdayjobs.com" for shard in ("wd1","wd2","wd3","wd5","wd6")))
+    if not out:
+        out["myworkdayjobs.com"] = None
+    return tuple(out)[:WD_MAX_HOSTS]
 
 def _hosts(company: Dict[str, Any]) -> List[str]:
-    out: List[str] = []
     hosts = company.get("workday_hosts")
-    if isinstance(hosts, list) and hosts:
-        out.extend([h.strip() for h in hosts if isinstance(h, str) and h.strip()])
+    user = tuple(h.strip() for h in hosts if isinstance(h, str) and h.strip()) if isinstance(hosts, list) else ()
     host = company.get("workday_host")
-    if isinstance(host, str) and host.strip() and host.strip() not in out:
-        out.append(host.strip())
+    host = host.strip() if isinstance(host, str) else ""
     tenant = (company.get("workday_tenant") or "").strip().lower()
-    if tenant:
-        for shard in ("wd1","wd2","wd3","wd5","wd6"):
-            guess = f"{tenant}.{shard}.myworkdayjobs.com"
-            if guess not in out:
-                out.append(guess)
-    if not out:
-        out.append("myworkdayjobs.com")
-    return out[:WD_MAX_HOSTS]
+    return list(_hosts_for(tenant, user, host))
 
-def _sites(company: Dict[str, Any]) -> List[str]:
-    sites: List[str] = []
-    user = company.get("workday_sites") or company.get("sites")
-    if isinstance(user, list) and user:
-        sites.extend([s for s in user if isinstance(s, str) and s.strip()])
-    name = (company.get("name") or "").lower()
+@functools.lru_cache(maxsize=256)
+def _sites_for(name: str, user_sites: Tuple[str, ...]) -> Tuple[str, ...]:
+    sites: Dict[str, None] = dict.fromkeys(user_sites)
     if "universal" in name or "umg" in name:
-        for s in ("UMGUS","UMGUK","universal-music-group","UNIVERSAL-MUSIC-GROUP"):
-            if s not in sites: sites.append(s)
+        sites.update(dict.fromkeys(("UMGUS","UMGUK","universal-music-group","UNIVERSAL-MUSIC-GROUP")))
     if "warner" in name or "wmg" in name:
-        for s in ("WMGUS","WMGGLOBAL","WMG","Wmg"):
-            if s not in sites: sites.append(s)
-    for s in DEFAULT_SITES:
-        if s not in sites: sites.append(s)
-    return sites[:WD_MAX_SITES]
+        sites.update(dict.fromkeys(("WMGUS","WMGGLOBAL","WMG","Wmg")))
+    sites.update(dict.fromkeys(DEFAULT_SITES))
+    return tuple(sites)[:WD_MAX_SITES]
+
+def _sites(company: Dict[str, Any]) -> List[str]:
+    # Both candidate lists depend only on these few fields, so they are cached on them.
+    user = company.get("workday_sites") or company.get("sites")
+    user = tuple(s for s in user if isinstance(s, str) and s.strip()) if isinstance(user, list) else ()
+    return list(_sites_for((company.get("name") or "").lower(), user))
+
+# Accept-Encoding is left to httpx: it advertises br/zstd only when their decoders
+# are installed (the brotli/zstd extras), so a response is never undecodable.
+_BASE_HEADERS = MappingProxyType({
+    "Accept": "*/*",
+    "Accept-Language": "en-US,en;q=0.8",
+    "Cache-Control": "no-cache",
+    "Pragma": "no-cache",
+    "Content-Type": "application/json",
+    "User-Agent": ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"),
+    "X-Requested-With": "XMLHttpRequest",
+    "X-Workday-Client": "browser",
+    "Sec-Fetch-Site": "same-site",
+    "Sec-Fetch-Mode": "cors",
+    "Sec-Fetch-Dest": "empty",
+    "Sec-CH-UA": '"Chromium";v="124", "Not:A-Brand";v="99"',
+    "Sec-CH-UA-Mobile": "?0",
+    "Sec-CH-UA-Platform": '"Linux"',
+})
 
 def _headers(host: str, site: str) -> Dict[str,str]:
     return {
-        "Accept": "*/*",
-        "Accept-Language": "en-US,en;q=0.8",
-        "Cache-Control": "no-cache",
-        "Pragma": "no-cache",
-        "Content-Type": "application/json",
+        **_BASE_HEADERS,
         "Origin": f"https://{host}",
         "Referer": f"https://{host}/{site}",
-        "User-Agent": ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
-                       "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"),
-        "X-Requested-With": "XMLHttpRequest",
-        "X-Workday-Client": "browser",
-        "X-Workday-Request-Id": str(uuid.uuid4()),
-        "Sec-Fetch-Site": "same-site",
-        "Sec-Fetch-Mode": "cors",
-        "Sec-Fetch-Dest": "empty",
-        "Sec-CH-UA": '"Chromium";v="124", "Not:A-Brand";v="99"',
-        "Sec-CH-UA-Mobile": "?0",
-        "Sec-CH-UA-Platform": '"Linux"',
+        "X-Workday-Request-Id": uuid.uuid4().hex,
     }
 
-def _warmup(client: httpx.Client, host: str, site: str):
+# (host, site) pairs already warmed on each client; the cookies live in its jar.
+_WARMED: "weakref.WeakKeyDictionary[httpx.AsyncClient, Set[Tuple[str, str]]]" = weakref.WeakKeyDictionary()
+
+# Most tenants answer CXS without a session; these ask for the cookies first.
+_NEEDS_SESSION = frozenset((401, 403, 419))
+
+# (site, gql_url, headers) for one host
+Target = Tuple[str, str, Mapping[str, str]]
+
+@dataclass(frozen=True, slots=True)
+class WorkdayPlan:
+    hosts: Tuple[str, ...]
+    targets: Mapping[str, Tuple[Target, ...]]  # host -> its targets, in site order
+
+@functools.lru_cache(maxsize=256)
+def _build_plan(tenant: str, hosts: Tuple[str, ...], sites: Tuple[str, ...]) -> WorkdayPlan:
+    return WorkdayPlan(hosts, MappingProxyType({
+        host: tuple((site, f"https://{host}/wday/cxs/{tenant}/{site}/graphql", MappingProxyType(_headers(host, site)))
+                    for site in sites)
+        for host in hosts
+    }))
+
+def build_plan(company: Dict[str, Any]) -> WorkdayPlan:
+    """
+    Every URL and header set a company's probes need, assembled once and cached
+    on the fields it depends on (the request id is fixed per plan, like a browser tab's).
+    """
+    tenant = (company.get("workday_tenant") or "").strip()
+    return _build_plan(tenant, tuple(_hosts(company)), tuple(_sites(company)))
+
+async def _warmup(client: httpx.AsyncClient, host: str, site: str):
+    warmed = _WARMED.setdefault(client, set())
+    if (host, site) in warmed:
+        return
     for u in (f"https://{host}/{site}",
               f"https://{host}/wday/authenticate",
               f"https://{host}/"):
         try:
-            client.get(u, headers={"User-Agent": _headers(host, site)["User-Agent"]}, follow_redirects=True)
+            await client.get(u, headers={"User-Agent": _BASE_HEADERS["User-Agent"]}, follow_redirects=True)
         except Exception:
             pass
-        time.sleep(0.2)
+    warmed.add((host, site))
 
-def _map_node(host: str, company: Dict[str, Any], node: Dict[str, Any]) -> Dict[str, Any]:
-    locs = node.get("locations") or []
+def _map_node(host: str, name: Optional[str], node: Dict[str, Any]) -> Dict[str, Any]:
+    norm = _norm
+    get = node.get
     loc_out = []
-    if isinstance(locs, list):
+    locs = get("locations")
+    if type(locs) is list:
         for l in locs:
-            if isinstance(l, dict):
-                city = _norm(l.get("city"))
-                region = _norm(l.get("region"))
-                country = _norm(l.get("country") or l.get("countryCode"))
-                loc_out.append(_join([city, region, country]))
-    location = "; ".join([p for p in loc_out if p]) if loc_out else ""
-
-    url = _norm(node.get("externalUrl") or node.get("applyUrl") or "")
+            if type(l) is dict:
+                loc = ", ".join([p for p in (norm(l.get("city")), norm(l.get("region")),
+                                             norm(l.get("country") or l.get("countryCode"))) if p])
+                if loc:
+                    loc_out.append(loc)
+    location = "; ".join(loc_out)
+
+    url = norm(get("externalUrl") or get("applyUrl") or "")
     if url.startswith("/"):
         url = f"https://{host}{url}"
 
     return {
         "source": "workday_gql",
-        "company": company.get("name"),
-        "id": _norm(node.get("id")) or None,
-        "title": _norm(node.get("title")),
+        "company": name,
+        "id": norm(get("id")) or None,
+        "title": norm(get("title")),
         "location": location,
         "remote": False,
-        "department": _norm(node.get("department") or node.get("jobFamily") or node.get("category")),
+        "department": norm(get("department") or get("jobFamily") or get("category")),
         "team": None,
         "url": url or None,
-        "posted_at": _norm(node.get("postedOn")) or None,
-        "description_snippet": _norm(node.get("jobPostingDescription"))[:240],
+        "posted_at": norm(get("postedOn")) or None,
+        # Slice before stripping so multi-KB descriptions never get copied whole.
+        "description_snippet": str(get("jobPostingDescription") or "")[:260].strip()[:240],
     }
 
 class HttpRetriableError(Exception): pass
 
-@retry(wait=wait_exponential(min=1, max=8), stop=stop_after_attempt(3),
-       retry=retry_if_exception_type(HttpRetriableError))
-def _post(client: httpx.Client, url: str, payload: Dict[str, Any], headers: Dict[str,str]) -> httpx.Response:
-    r = client.post(url, json=payload, headers=headers)
-    if r.status_code == 429 or (500 <= r.status_code < 600):
-        raise HttpRetriableError(f"{r.status_code} for {url}")
-    return r
+# host -> time.monotonic() before which we hold off, from a 429's Retry-After
+_BACKOFF: Dict[str, float] = {}
 
-def fetch(company: Dict[str, Any]) -> List[Dict[str, Any]]:
-    # only handle workday_gql companies
-    if (company.get("ats") or "").lower() != "workday_gql":
+def _retry_after(r: httpx.Response) -> float:
+    try:
+        return float(r.headers.get("Retry-After") or 0)
+    except ValueError:
+        return 0.0  # HTTP-date form; let the jittered backoff handle it
+
+async def _post(client: httpx.AsyncClient, url: str, body: bytes, headers: Mapping[str,str],
+                site: Optional[str] = None) -> httpx.Response:
+    """
+    Returns an open streamed response; the caller must aread()/aiter or aclose() it.
+    Connection-level failures are retried by the transport; this loop only
+    handles 429/5xx, waiting out any Retry-After hold-off for the host.
+    With a site, a 401/403/419 gets one warmup of that site and a re-send.
+    """
+    host = url.split("/", 3)[2]
+    for i in range(RETRIES):
+        # Only wait when the server has asked us to; no fixed pause between pages.
+        remaining = _BACKOFF.get(host, 0.0) - time.monotonic()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        # headers already carry Content-Type: application/json
+        r = await client.send(client.build_request("POST", url, content=body, headers=headers), stream=True)
+        if r.status_code in _NEEDS_SESSION and site is not None:
+            await r.aclose()
+            await _warmup(client, host, site)
+            site = None
+            r = await client.send(client.build_request("POST", url, content=body, headers=headers), stream=True)
+        if r.status_code != 429 and not (500 <= r.status_code < 600):
+            return r
+        await r.aclose()
+        if r.status_code == 429:
+            ra = _retry_after(r)
+            if ra > 0:
+                _BACKOFF[host] = time.monotonic() + ra
+        if i + 1 < RETRIES:
+            await asyncio.sleep(min(8, 2 ** i + random.random()))  # jittered exponential
+    raise HttpRetriableError(f"{r.status_code} for {url}")
+
+async def _read_nodes(resp: httpx.Response, host: str, name: Optional[str]) -> List[Dict[str, Any]]:
+    if ijson is not None and int(resp.headers.get("Content-Length") or 0) > WD_STREAM_MIN_BYTES:
+        # Large pages are mapped node by node as bytes arrive, so peak memory is
+        # about one node rather than the whole parsed tree.
+        nodes = ijson.sendable_list()
+        coro = ijson.items_coro(nodes, "data.jobPostings.edges.item.node")
+        mapped: List[Dict[str, Any]] = []
+        async for chunk in resp.aiter_bytes():
+            coro.send(chunk)
+            mapped.extend(_map_node(host, name, n) for n in nodes if type(n) is dict)
+            del nodes[:]
+        coro.close()
+        mapped.extend(_map_node(host, name, n) for n in nodes if type(n) is dict)
+        return mapped
+
+    data = orjson.loads(await resp.aread())
+    jp = (((data or {}).get("data") or {}).get("jobPostings") or {})
+    edges = jp.get("edges") or []
+    if not isinstance(edges, list):
         return []
+    return [_map_node(host, name, n) for e in edges
+            if type(e) is dict and type(n := e.get("node")) is dict]
 
-    out: List[Dict[str, Any]] = []
-    attempts: List[Dict[str, Any]] = []
+# hosts whose GraphQL rejected the page-aliased document; they page one POST at a time
+_NO_ALIAS: Set[str] = set()
 
-    tenant = (company.get("workday_tenant") or "").strip()
-    if not tenant:
+async def _post_pages(client: httpx.AsyncClient, gql_url: str, hh: Mapping[str, str], host: str, site: str,
+                      name: Optional[str], attempts: List[Dict[str, Any]]) -> Optional[List[Dict[str, Any]]]:
+    """Every page of one board in one aliased POST; None if the host won't take it."""
+    try:
+        resp = await _post(client, gql_url, _batch_body(WD_MAX_PAGES), hh, site)
+    except HttpRetriableError:
+        if GQL_DEBUG: attempts.append({"u": gql_url, "pages": WD_MAX_PAGES, "s": "5xx/429", "items": 0})
         return []
+    except Exception as e:
+        if GQL_DEBUG: attempts.append({"u": gql_url, "pages": WD_MAX_PAGES, "s": "error", "err": str(e), "items": 0})
+        return []
+    try:
+        ct = (resp.headers.get("Content-Type") or "").lower()
+        if resp.status_code == 400:
+            _NO_ALIAS.add(host)
+            return None
+        if resp.status_code != 200 or "json" not in ct:
+            if GQL_DEBUG: attempts.append({"u": gql_url, "pages": WD_MAX_PAGES, "s": resp.status_code, "ct": ct, "items": 0})
+            return []
+        try:
+            data = orjson.loads(await resp.aread())
+        except Exception as e:
+            if GQL_DEBUG: attempts.append({"u": gql_url, "pages": WD_MAX_PAGES, "s": "bad-json", "err": str(e), "items": 0})
+            return []
+    finally:
+        await resp.aclose()
+
+    block = (data or {}).get("data") if isinstance(data, dict) else None
+    if not isinstance(block, dict) or "p0" not in block:
+        _NO_ALIAS.add(host)  # errors-only answer: aliasing isn't accepted here
+        return None
+    mapped: List[Dict[str, Any]] = []
+    for i in range(WD_MAX_PAGES):
+        edges = ((block.get(f"p{i}") or {}).get("edges")) or []
+        page = [_map_node(host, name, n) for e in edges
+                if type(e) is dict and type(n := e.get("node")) is dict]
+        mapped.extend(page)
+        if len(page) < LIMIT:
+            break
+    if GQL_DEBUG: attempts.append({"u": gql_url, "pages": WD_MAX_PAGES, "s": 200, "ct": ct, "items": len(mapped)})
+    return mapped
+
+# host -> site whose GraphQL board last returned edges; tried first next time
+_GOOD_SITE: Dict[str, str] = {}
+
+async def _probe_host(client: httpx.AsyncClient, name: Optional[str], host: str, targets: Tuple[Target, ...],
+                      attempts: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Walks one host's sites in order; returns its jobs and the first site that had any."""
+    out: List[Dict[str, Any]] = []
+    hit: Optional[str] = None
+    good = _GOOD_SITE.get(host)
+    if good:
+        targets = sorted(targets, key=lambda t: t[0] != good)  # stable: good site first
+    for site, gql_url, hh in targets:
+        # Without the early break every page is wanted, so ask for them all at once.
+        if not WD_EARLY_BREAK and WD_MAX_PAGES > 1 and host not in _NO_ALIAS:
+            mapped = await _post_pages(client, gql_url, hh, host, site, name, attempts)
+            if mapped is not None:
+                if mapped:
+                    hit = hit or site
+                    out.extend(mapped)
+                continue
 
-    hosts = _hosts(company)
-    sites = _sites(company)
-
-    with httpx.Client(timeout=TIMEOUT_SECS, follow_redirects=True) as client:
-        for host in hosts:
+        offset = 0
+        pages = 0
+        while pages < WD_MAX_PAGES:
             try:
-                client.cookies.set("wd-browser-id", str(uuid.uuid4()), domain=host)
-            except Exception:
-                client.cookies.set("wd-browser-id", str(uuid.uuid4()))
-
-            for site in sites:
-                _warmup(client, host, site)
-                hh = _headers(host, site)
-                gql_url = f"https://{host}/wday/cxs/{tenant}/{site}/graphql"
-
-                offset = 0
-                pages = 0
-                while pages < WD_MAX_PAGES:
-                    payload = {
-                        "operationName": "SearchJobs",
-                        "variables": {
-                            "limit": LIMIT,
-                            "offset": offset,
-                            "searchText": None,
-                            "appliedFacets": {}  # fetch everything, we'll filter later
-                        },
-                        "query": GQL_QUERY
-                    }
-
-                    try:
-                        resp = _post(client, gql_url, payload, hh)
-                    except HttpRetriableError:
-                        attempts.append({"u": gql_url, "offset": offset, "s": "5xx/429", "items": 0})
-                        break
-                    except Exception as e:
-                        attempts.append({"u": gql_url, "offset": offset, "s": "error", "err": str(e), "items": 0})
-                        break
-
-                    ct = (resp.headers.get("Content-Type") or "").lower()
-                    if resp.status_code != 200 or "json" not in ct:
-                        attempts.append({"u": gql_url, "offset": offset, "s": resp.status_code, "ct": ct, "items": 0})
-                        break
-
-                    try:
-                        data = resp.json()
-                    except Exception as e:
-                        attempts.append({"u": gql_url, "offset": offset, "s": "bad-json", "err": str(e), "items": 0})
-                        break
-
-                    jp = (((data or {}).get("data") or {}).get("jobPostings") or {})
-                    edges = jp.get("edges") or []
-                    if not isinstance(edges, list) or not edges:
-                        attempts.append({"u": gql_url, "offset": offset, "s": resp.status_code, "ct": ct, "items": 0})
-                        break
-
-                    mapped = []
-                    for e in edges:
-                        if isinstance(e, dict) and isinstance(e.get("node"), dict):
-                            mapped.append(_map_node(host, company, e["node"]))
+                resp = await _post(client, gql_url, _body(offset), hh, site)
+            except HttpRetriableError:
+                if GQL_DEBUG: attempts.append({"u": gql_url, "offset": offset, "s": "5xx/429", "items": 0})
+                break
+            except Exception as e:
+                if GQL_DEBUG: attempts.append({"u": gql_url, "offset": offset, "s": "error", "err": str(e), "items": 0})
+                break
 
-                    out.extend(mapped)
-                    attempts.append({"u": gql_url, "offset": offset, "s": resp.status_code, "ct": ct, "items": len(mapped)})
+            try:
+                ct = (resp.headers.get("Content-Type") or "").lower()
+                if resp.status_code != 200 or "json" not in ct:
+                    if GQL_DEBUG: attempts.append({"u": gql_url, "offset": offset, "s": resp.status_code, "ct": ct, "items": 0})
+                    break
+
+                try:
+                    mapped = await _read_nodes(resp, host, name)
+                except Exception as e:
+                    if GQL_DEBUG: attempts.append({"u": gql_url, "offset": offset, "s": "bad-json", "err": str(e), "items": 0})
+                    break
+            finally:
+                await resp.aclose()
+
+            if not mapped:
+                if GQL_DEBUG: attempts.append({"u": gql_url, "offset": offset, "s": resp.status_code, "ct": ct, "items": 0})
+                break
+
+            if GQL_DEBUG: attempts.append({"u": gql_url, "offset": offset, "s": resp.status_code, "ct": ct, "items": len(mapped)})
+            hit = hit or site
+            out.extend(mapped)
+
+            if WD_EARLY_BREAK:
+                return out, hit  # first page of the first site with jobs is enough
+
+            if len(mapped) < LIMIT:
+                break
+
+            offset += LIMIT
+            pages += 1
+    return out, hit
+
+# host -> answered a cheap HEAD (resolves, no 5xx); kept for the process lifetime
+_HOST_ALIVE: Dict[str, bool] = {}
+
+async def _alive(client: httpx.AsyncClient, host: str) -> bool:
+    hit = _HOST_ALIVE.get(host)
+    if hit is not None:
+        return hit
+    try:
+        r = await client.head(f"https://{host}/", timeout=3, follow_redirects=False)
+    except httpx.TimeoutException:
+        return True  # slow isn't dead; probe it anyway and don't cache
+    except httpx.HTTPError:
+        ok = False  # DNS failure / refused: wrong shard guess
+    else:
+        ok = r.status_code < 500
+    _HOST_ALIVE[host] = ok
+    return ok
+
+def new_client() -> httpx.AsyncClient:
+    # One pooled HTTP/2 client: warmups and POSTs to a host share a single TLS
+    # connection instead of handshaking per request.
+    limits = httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=30)
+    # retries= covers connect errors only; status-based retries stay in _post.
+    transport = httpx.AsyncHTTPTransport(http2=True, limits=limits, retries=2)
+    return httpx.AsyncClient(transport=transport, timeout=TIMEOUT_SECS, follow_redirects=True)
+
+def _dedupe(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # Tenants list the same posting on several shards (wd1/wd5) and sites; the
+    # requisition id (or, failing that, the URL path) is the same on all of them.
+    seen: Set[str] = set()
+    out: List[Dict[str, Any]] = []
+    for j in jobs:
+        key = j.get("id") or urlsplit(j.get("url") or "").path
+        if key:
+            if key in seen:
+                continue
+            seen.add(key)
+        out.append(j)
+    return out
 
-                    if WD_EARLY_BREAK and mapped:
-                        if GQL_DEBUG:
-                            print(f"WORKDAY_GQL_DEBUG {company.get('name')}: tried={json.dumps(attempts)[:2000]} got={len(out)}")
-                        return out
+async def _fetch_with(client: httpx.AsyncClient, company: Dict[str, Any]) -> List[Dict[str, Any]]:
+    out: List[Dict[str, Any]] = []
+    attempts: List[Dict[str, Any]] = []  # only filled when WORKDAY_GQL_DEBUG is on
 
-                    if len(mapped) < LIMIT:
-                        break
+    plan = build_plan(company)
+    hosts = plan.hosts
 
-                    offset += LIMIT
-                    pages += 1
-                    time.sleep(PAUSE_BETWEEN)
+    # One HEAD per host (not per site) weeds out shard guesses that don't resolve
+    # before they cost warmups and a POST per site. If none answer, probe them all.
+    alive = await asyncio.gather(*[_alive(client, h) for h in hosts])
+    hosts = [h for h, ok in zip(hosts, alive) if ok] or hosts
 
-                time.sleep(PAUSE_BETWEEN)
+    # One pass over the jar instead of a cookies.get() scan per host.
+    have_id = {c.domain for c in client.cookies.jar if c.name == "wd-browser-id" and c.value}
+    for host in hosts:
+        if host in have_id:
+            continue  # keep the id the warmed session was built on
+        try:
+            client.cookies.set("wd-browser-id", str(uuid.uuid4()), domain=host)
+        except Exception:
+            client.cookies.set("wd-browser-id", str(uuid.uuid4()))
+
+    # Hosts run concurrently, sites and pages within a host stay sequential.
+    # Results are keyed by the host's plan index and merged in that order, as in
+    # a sequential walk. Under WD_EARLY_BREAK a hit cancels only the lower-priority
+    # hosts still running; the best host with jobs wins, not the fastest.
+    index = {asyncio.ensure_future(_probe_host(client, company.get("name"), host, plan.targets[host], attempts)): i
+             for i, host in enumerate(hosts)}
+    got: Dict[int, Tuple[List[Dict[str, Any]], Optional[str]]] = {}
+    pending = set(index)
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for t in done:
+                if t.cancelled() or t.exception() is not None:
+                    continue  # one bad host doesn't sink the others
+                if t.result()[0]:
+                    got[index[t]] = t.result()
+            if WD_EARLY_BREAK and got:
+                best = min(got)
+                for t in [t for t in pending if index[t] > best]:
+                    t.cancel()  # an open streamed response is closed by _probe_host's finally
+                    pending.discard(t)
+    finally:
+        for t in pending:
+            t.cancel()
+        await asyncio.gather(*index, return_exceptions=True)
+
+    for i in sorted(got):
+        items, site = got[i]
+        _GOOD_SITE[hosts[i]] = site  # only hosts whose jobs are kept
+        out.extend(items)
+        if WD_EARLY_BREAK:
+            break
+
+    out = _dedupe(out)
 
     if GQL_DEBUG:
-        print(f"WORKDAY_GQL_DEBUG {company.get('name')}: tried={json.dumps(attempts)[:2000]} got={len(out)}")
+        print(f"WORKDAY_GQL_DEBUG {company.get('name')}: tried={orjson.dumps(attempts).decode()[:2000]} got={len(out)}")
 
     return out
+
+async def fetch_async(company: Dict[str, Any], client: Optional[httpx.AsyncClient] = None) -> List[Dict[str, Any]]:
+    """
+    Async entry point. Pass a client from new_client() to reuse its pool
+    (and cookie jar, scoped per host) across companies.
+    """
+    # only handle workday_gql companies
+    if (company.get("ats") or "").lower() != "workday_gql":
+        return []
+
+    tenant = (company.get("workday_tenant") or "").strip()
+    if not tenant:
+        return []
+
+    if client is not None:
+        return await _fetch_with(client, company)
+    async with new_client() as own:
+        return await _fetch_with(own, company)
+
+# One long-lived event loop + client per thread, so TLS sessions, cookies and
+# warmups carry over between fetch() calls. An AsyncClient is bound to the loop
+# it first ran on, hence per thread rather than one module global.
+_LOCAL = threading.local()
+_SHARED: List[Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]] = []
+
+def _shared() -> Tuple[asyncio.AbstractEventLoop, httpx.AsyncClient]:
+    st = getattr(_LOCAL, "st", None)
+    if st is None:
+        st = _LOCAL.st = (asyncio.new_event_loop(), new_client())
+        _SHARED.append(st)
+    return st
+
+@atexit.register
+def _close_shared():
+    for loop, client in _SHARED:
+        try:
+            loop.run_until_complete(client.aclose())
+            loop.close()
+        except Exception:
+            pass
+
+def fetch(company: Dict[str, Any]) -> List[Dict[str, Any]]:
+    loop, client = _shared()
+    return loop.run_until_complete(fetch_async(company, client))
@@ -1,7 +1,10 @@
 # adapters/workday_pw.py
-import os, json, math
-from typing import List, Dict
-from playwright.sync_api import sync_playwright
+import os, re, math, time, asyncio, atexit, threading, weakref
+from typing import Any, List, Dict, Tuple
+from urllib.parse import urlsplit
+import httpx
+import orjson
+from playwright.async_api import async_playwright
 
 WD_LIMIT       = int(os.getenv("WD_LIMIT", "200"))
 WD_MAX_PAGES   = int(os.getenv("WD_MAX_PAGES", "2"))
@@ -10,6 +13,15 @@ WD_MAX_HOSTS   = int(os.getenv("WD_MAX_HOSTS", "2"))
 WD_MAX_SITES   = int(os.getenv("WD_MAX_SITES", "6"))
 PW_HEADLESS    = os.getenv("PW_HEADLESS", "1") == "1"
 DEBUG          = os.getenv("WORKDAY_PW_DEBUG", "0") == "1"
+WD_PW_DIRECT   = os.getenv("WD_PW_DIRECT", "1") == "1"
+WD_WORKERS     = int(os.getenv("WD_WORKERS", "6"))
+DIRECT_PAGE    = 20  # the public CXS /jobs POST caps limit at 20
+WD_PW_CAPTURE_MS = int(os.getenv("WD_PW_CAPTURE_MS", "4000"))
+WD_SITE_CACHE_TTL = int(os.getenv("WD_SITE_CACHE_TTL", "3600"))
+# Cookies + localStorage are saved here at exit and reloaded by the next run
+# while younger than the TTL; an empty path turns this off.
+PW_STATE_PATH  = os.getenv("WD_PW_STATE", ".cache/workday_pw_state.json")
+PW_STATE_TTL   = int(os.getenv("WD_PW_STATE_TTL", str(12 * 3600)))
 
 # Minimal GraphQL that many Workday tenants expose via CXS
 GRAPHQL_QUERY = """
@@ -26,14 +38,25 @@ query SearchJobs($limit: Int!, $offset: Int!) {
 }
 """
 
+# Nothing we read comes from these; aborting them keeps page loads to the HTML + JS
+_BLOCKED_EXTS    = ("png", "jpe?g", "gif", "svg", "webp", "ico", "woff2?", "ttf", "otf", "eot", "css", "mp4", "webm")
+_BLOCKED_DOMAINS = ("google-analytics", "googletagmanager", "doubleclick", "segment.io", "fullstory", "cookielaw", "onetrust")
+# Routed by pattern: the driver matches it, so only requests we abort ever
+# reach Python (a "**/*" route called back here for every subresource).
+_BLOCKED_RE = re.compile(r"\.(?:%s)(?:[?#]|$)|%s" % ("|".join(_BLOCKED_EXTS), "|".join(map(re.escape, _BLOCKED_DOMAINS))), re.I)
+
+async def _block_heavy(route):
+    await route.abort()
+
 def _log(s: str):
     if DEBUG: print(s)
 
-def _norm_job(host: str, site: str, j: Dict) -> Dict:
-    # normalize a Workday job from either graphql or /jobs JSON
+def _norm_job(base: str, company: str, j: Dict) -> Dict:
+    # normalize a Workday job from either graphql or /jobs JSON;
+    # base ("https://{host}/{site}") and company are computed once per site by the caller
     title = j.get("title") or j.get("titleLocalized") or ""
     path  = j.get("externalPath") or j.get("externalPathName") or j.get("externalPathNameLocalized") or ""
-    url   = f"https://{host}/{site}{path if path.startswith('/') else '/' + path}" if path else f"https://{host}/{site}"
+    url   = (base + path if path.startswith("/") else base + "/" + path) if path else base
     locs  = j.get("locations") or []
     # best-effort location string
     loc_txt = ""
@@ -42,149 +65,433 @@ def _norm_job(host: str, site: str, j: Dict) -> Dict:
         loc_txt = ", ".join([v for v in [loc0.get("city"), loc0.get("region"), loc0.get("country")] if v])
     elif isinstance(locs, dict):
         loc_txt = ", ".join([v for v in [locs.get("city"), locs.get("region"), locs.get("country")] if v])
+    if not loc_txt:
+        loc_txt = j.get("locationsText") or ""
 
     return {
         "source": "workday",
-        "company": host.split(".")[0].upper(),
+        "company": company,
         "title": title,
         "location": loc_txt,
         "url": url,
     }
 
-def _inpage_fetch_graphql(page, host: str, site: str, limit: int, offset: int):
+def _dedupe(jobs: List[Dict]) -> List[Dict]:
+    # The same posting is listed on several shards (wd1/wd5) and sites; its URL
+    # only differs in host and site, so key on the path after the site.
+    seen = set()
+    out: List[Dict] = []
+    for j in jobs:
+        parts = urlsplit(j.get("url") or "").path.split("/", 2)
+        key = parts[2] if len(parts) == 3 else ""
+        if key:
+            if key in seen:
+                continue
+            seen.add(key)
+        out.append(j)
+    return out
+
+# Paging goes through the context's APIRequestContext: it shares the cookies
+# the goto picked up but runs on the browser's network stack directly, so no
+# JS is evaluated and no result is stringified across CDP just to be re-parsed.
+# Both return {ok, items} where ok means the first page came back 200 with JSON.
+async def _read_json(resp):
+    if resp.status != 200:
+        return None
+    try:
+        data = orjson.loads(await resp.body())
+    except Exception:
+        return None
+    return data if isinstance(data, dict) else None
+
+async def _inpage_fetch_graphql(req, host: str, site: str, limit: int, max_pages: int):
     url = f"https://{host}/wday/cxs/{host.split('.')[0]}/{site}/graphql"
-    payload = {
-        "operationName": "SearchJobs",
-        "query": GRAPHQL_QUERY,
-        "variables": {"limit": limit, "offset": offset},
-    }
-    _log(f"WORKDAY_PW_DEBUG POST {url} -> (in-page)")
-    return page.evaluate(
-        """async ({url, payload}) => {
-            const res = await fetch(url, {
-              method: 'POST',
-              headers: {'content-type': 'application/json'},
-              body: JSON.stringify(payload),
-              credentials: 'include'
-            });
-            return {status: res.status, json: await res.json().catch(()=>null)};
-        }""",
-        {"url": url, "payload": payload},
-    )
-
-def _inpage_fetch_jobs(page, host: str, site: str, limit: int, offset: int, active_only=True):
-    url = f"https://{host}/wday/cxs/{host.split('.')[0]}/{site}/jobs?limit={limit}&offset={offset}"
-    if active_only:
-        url += "&activeOnly=true"
-    _log(f"WORKDAY_PW_DEBUG GET {url} -> (in-page)")
-    return page.evaluate(
-        """async (url) => {
-            const res = await fetch(url, { credentials: 'include' });
-            let data = null;
-            try { data = await res.json(); } catch(e) {}
-            return {status: res.status, json: data};
-        }""",
-        url,
-    )
-
-def _collect_from_site(context, host: str, site: str) -> List[Dict]:
-    jobs: List[Dict] = []
-    page = context.new_page()
-    # Load the site first to receive first-party cookies
-    root = f"https://{host}/{site}"
-    _log(f"WORKDAY_PW_DEBUG load {root}")
+    _log(f"WORKDAY_PW_DEBUG POST {url} -> (up to {max_pages} pages)")
+
+    async def post(offset):
+        body = {"operationName": "SearchJobs", "query": GRAPHQL_QUERY, "variables": {"limit": limit, "offset": offset}}
+        resp = await req.post(url, data=orjson.dumps(body), headers={"content-type": "application/json"}, timeout=30000)
+        return resp.status, await _read_json(resp)
+
+    def block(data):
+        return ((data or {}).get("data") or {}).get("jobSearch") or {}
+
+    status, data = await post(0)
+    if not data:
+        return {"ok": False, "status": status}
+    total = int(block(data).get("totalCount") or 0)
+    items = block(data).get("results") or []
+    out = list(items)
+    offset, pages = 0, 1
+    while len(out) < total and pages < max_pages:
+        offset += len(items) or limit
+        status, data = await post(offset)
+        if not data:
+            break
+        items = block(data).get("results") or []
+        if not items:
+            break
+        out.extend(items)
+        pages += 1
+    return {"ok": True, "items": out}
+
+async def _inpage_fetch_jobs(req, host: str, site: str, limit: int, max_pages: int, active_only=True):
+    url = f"https://{host}/wday/cxs/{host.split('.')[0]}/{site}/jobs"
+    _log(f"WORKDAY_PW_DEBUG GET {url} -> (up to {max_pages} pages)")
+
+    async def get(offset):
+        params = {"limit": limit, "offset": offset}
+        if active_only:
+            params["activeOnly"] = "true"
+        resp = await req.get(url, params=params, headers={"Accept": "application/json"}, timeout=30000)
+        return resp.status, await _read_json(resp)
+
+    status, data = await get(0)
+    if not data:
+        return {"ok": False, "status": status}
+    items = data.get("jobPostings") or data.get("jobPostingsPage") or data.get("jobPostingsV2") or data.get("jobPostingsV3") or []
+    # Some tenants return {"items":[...], "total":N}
+    if "items" in data:
+        items = data.get("items") or []
+    out = list(items) if isinstance(items, list) else []
+    offset, pages = 0, 1
+    while items and pages < max_pages:
+        offset += len(items)
+        status, data = await get(offset)
+        if not data:
+            break
+        items = data.get("jobPostings") or data.get("items") or []
+        if not items:
+            break
+        out.extend(items)
+        pages += 1
+    return {"ok": True, "items": out}
+
+def _jobs_url_re(host: str) -> "re.Pattern":
+    # This tenant's CXS /jobs endpoint on any site, query string or not.
+    return re.compile(rf"https://{re.escape(host)}/wday/cxs/{re.escape(host.split('.')[0])}/[^/?]+/jobs(?:\?|$)")
+
+def _is_jobs_response(resp, jobs_re: "re.Pattern") -> bool:
+    # Only a successful answer for this tenant's board ends the wait; an early
+    # 4xx (e.g. before the session cookie lands) leaves room for the real one.
+    # The URL check goes first: it turns away nearly every event on its own.
+    return (jobs_re.match(resp.url) is not None and resp.status == 200
+            and resp.request.method == "POST")
+
+async def _captured_items(captured: "asyncio.Future") -> List[Dict]:
+    # The site's own app POSTs /jobs as it boots. If that one response already
+    # holds every posting there's nothing left to fetch ourselves.
     try:
-        page.goto(root, wait_until="domcontentloaded", timeout=30000)
-    except Exception as e:
-        _log(f"WORKDAY_PW_DEBUG error loading {root}: {e}")
-        page.close()
-        return jobs
+        resp = await asyncio.wait_for(captured, WD_PW_CAPTURE_MS / 1000)
+        data = orjson.loads(await resp.body())
+    except Exception:
+        return []
+    items = data.get("jobPostings") if isinstance(data, dict) else None
+    if not isinstance(items, list) or not items or len(items) < int(data.get("total") or 0):
+        return []
+    return items
 
+async def _request_site(req, host: str, site: str, root: str, company: str) -> List[Dict]:
     # Try GraphQL first (more stable pagination)
     try:
-        offset = 0
-        pages  = 0
-        first  = _inpage_fetch_graphql(page, host, site, min(WD_LIMIT, 200), offset)
-        if first and first.get("status") == 200 and first.get("json"):
-            data = first["json"].get("data") or {}
-            block = (data.get("jobSearch") or {})
-            total = int(block.get("totalCount") or 0)
-            items = block.get("results") or []
-            jobs.extend([_norm_job(host, site, j) for j in items])
-            pages += 1
-            while len(jobs) < total and pages < WD_MAX_PAGES:
-                offset += len(items) if items else WD_LIMIT
-                nxt = _inpage_fetch_graphql(page, host, site, min(WD_LIMIT, 200), offset)
-                if not nxt or nxt.get("status") != 200 or not nxt.get("json"):
-                    break
-                data = nxt["json"].get("data") or {}
-                items = (data.get("jobSearch") or {}).get("results") or []
-                if not items:
-                    break
-                jobs.extend([_norm_job(host, site, j) for j in items])
-                pages += 1
-            page.close()
-            return jobs
+        res = await _inpage_fetch_graphql(req, host, site, min(WD_LIMIT, 200), WD_MAX_PAGES)
+        if res and res.get("ok"):
+            return [_norm_job(root, company, j) for j in res.get("items") or [] if isinstance(j, dict)]
     except Exception as e:
         _log(f"WORKDAY_PW_DEBUG graphql fallback on {host}/{site}: {e}")
 
     # Fallback: /jobs JSON
     try:
-        offset = 0
-        pages  = 0
-        first = _inpage_fetch_jobs(page, host, site, min(WD_LIMIT, 200), offset, active_only=True)
-        if first and first.get("status") == 200 and first.get("json"):
-            data  = first["json"]
-            items = data.get("jobPostings") or data.get("jobPostingsPage") or data.get("jobPostingsV2") or data.get("jobPostingsV3") or []
-            # Some tenants return {"items":[...], "total":N}
-            if isinstance(data, dict) and "items" in data:
-                items = data.get("items") or []
-            jobs.extend([_norm_job(host, site, j) for j in items if isinstance(j, dict)])
-            pages += 1
-            while items and pages < WD_MAX_PAGES:
-                offset += len(items)
-                nxt = _inpage_fetch_jobs(page, host, site, min(WD_LIMIT, 200), offset, active_only=True)
-                if not nxt or nxt.get("status") != 200 or not nxt.get("json"):
-                    break
-                data  = nxt["json"]
-                items = data.get("jobPostings") or data.get("items") or []
-                if not items:
-                    break
-                jobs.extend([_norm_job(host, site, j) for j in items if isinstance(j, dict)])
-                pages += 1
+        res = await _inpage_fetch_jobs(req, host, site, min(WD_LIMIT, 200), WD_MAX_PAGES, active_only=True)
+        if res and res.get("ok"):
+            return [_norm_job(root, company, j) for j in res.get("items") or [] if isinstance(j, dict)]
     except Exception as e:
         _log(f"WORKDAY_PW_DEBUG jobs fallback on {host}/{site}: {e}")
+    return []
 
-    page.close()
-    return jobs
+async def _collect_from_site(context, host: str, site: str, company: str, load: bool = True) -> List[Dict]:
+    # load=False: the host's cookies are already in the context (a sibling site
+    # loaded its page), so go straight to the JSON endpoints.
+    root = f"https://{host}/{site}"
+    if not load:
+        return await _request_site(context.request, host, site, root, company)
+    page = await context.new_page()
+    captured = asyncio.get_running_loop().create_future()
+    jobs_re = _jobs_url_re(host)
 
-def fetch(company: Dict) -> List[Dict]:
+    def on_response(resp):
+        if not captured.done() and _is_jobs_response(resp, jobs_re):
+            captured.set_result(resp)
+
+    page.on("response", on_response)
+    try:
+        # Load the site first to receive first-party cookies
+        _log(f"WORKDAY_PW_DEBUG load {root}")
+        try:
+            await page.goto(root, wait_until="domcontentloaded", timeout=30000)
+        except Exception as e:
+            _log(f"WORKDAY_PW_DEBUG error loading {root}: {e}")
+            return []
+
+        items = await _captured_items(captured)
+        if items:
+            _log(f"WORKDAY_PW_DEBUG captured {len(items)} jobs from {root}")
+            return [_norm_job(root, company, j) for j in items if isinstance(j, dict)]
+        return await _request_site(context.request, host, site, root, company)
+    finally:
+        page.remove_listener("response", on_response)
+        await page.close()
+
+_HTTP_HEADERS = {
+    "Accept": "application/json",
+    "Content-Type": "application/json",
+    "User-Agent": ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+                   "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36"),
+}
+
+async def _direct_site(client: httpx.AsyncClient, host: str, site: str, company: str) -> List[Dict]:
+    # Public CXS job search: a plain JSON POST, no cookies or XSRF needed.
+    url = f"https://{host}/wday/cxs/{host.split('.')[0]}/{site}/jobs"
+    root = f"https://{host}/{site}"
+    jobs: List[Dict] = []
+    offset = 0
+    while len(jobs) < WD_LIMIT:
+        try:
+            r = await client.post(url, content=orjson.dumps({"appliedFacets": {}, "limit": DIRECT_PAGE, "offset": offset, "searchText": ""}))
+        except httpx.HTTPError as e:
+            _log(f"WORKDAY_PW_DEBUG direct {url}: {e}")
+            break
+        if r.status_code != 200 or "json" not in (r.headers.get("Content-Type") or ""):
+            _log(f"WORKDAY_PW_DEBUG direct {url} -> {r.status_code}")
+            break
+        try:
+            items = orjson.loads(r.content).get("jobPostings") or []
+        except Exception:
+            break
+        jobs.extend([_norm_job(root, company, j) for j in items if isinstance(j, dict)])
+        if len(items) < DIRECT_PAGE:
+            break
+        offset += DIRECT_PAGE
+    return jobs[:WD_LIMIT]
+
+# Companies often share a tenant (several UMG labels on umusic.wd5...), so
+# (host, site) results are kept for the run and handed to the next company
+# instead of scraped again. Keyed by path too: an empty direct answer says
+# nothing about what the browser would find.
+_SITE_CACHE: Dict[Tuple[str, str, str], Tuple[float, List[Dict]]] = {}
+
+def _site_cached(kind: str, host: str, site: str, company: str):
+    hit = _SITE_CACHE.get((kind, host, site))
+    if hit is None or time.monotonic() - hit[0] >= WD_SITE_CACHE_TTL:
+        return None
+    return [dict(j, company=company) for j in hit[1]]
+
+def _site_store(kind: str, host: str, site: str, jobs: List[Dict]):
+    _SITE_CACHE[(kind, host, site)] = (time.monotonic(), jobs)
+
+async def _fetch_direct(client: httpx.AsyncClient, hosts: List[str], sites: List[str], company: str) -> Tuple[List[Dict], List[Dict]]:
+    async def one_site(host: str, site: str) -> List[Dict]:
+        got = _site_cached("direct", host, site, company)
+        if got is None:
+            got = await _direct_site(client, host, site, company)
+            _site_store("direct", host, site, got)
+        return got
+
+    async def one_host(host: str) -> Tuple[List[Dict], List[Dict]]:
+        jobs: List[Dict] = []
+        tried: List[Dict] = []
+        # With the early break a host's sites go one at a time (the first hit ends
+        # it); without it every site is wanted, so they're all in flight at once.
+        if WD_EARLY_BREAK:
+            results = []
+            for site in sites:
+                results.append(await one_site(host, site))
+                if results[-1]:
+                    break
+        else:
+            results = await asyncio.gather(*[one_site(host, site) for site in sites])
+        for site, got in zip(sites, results):
+            if DEBUG:
+                tried.append({"host": host, "site": site, "url": f"https://{host}/wday/cxs/{host.split('.')[0]}/{site}/jobs", "status": "direct", "items": len(got)})
+            jobs.extend(got)
+        return jobs, tried
+
+    out: List[Dict] = []
+    tried: List[Dict] = []
+    for jobs, t in await asyncio.gather(*[one_host(h) for h in hosts]):
+        out.extend(jobs)
+        tried.extend(t)
+    return out, tried
+
+# Browser, context and HTTP client per event loop, created lazily and reused by
+# every company fetched on that loop (Playwright and httpx objects are bound to
+# the loop that made them).
+_STATE: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, Any]]" = weakref.WeakKeyDictionary()
+
+def _state() -> Dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    st = _STATE.get(loop)
+    if st is None:
+        st = _STATE[loop] = {"lock": asyncio.Lock()}
+    return st
+
+def _saved_state():
+    try:
+        if PW_STATE_PATH and time.time() - os.path.getmtime(PW_STATE_PATH) < PW_STATE_TTL:
+            return PW_STATE_PATH
+    except OSError:
+        pass
+    return None
+
+def _http() -> httpx.AsyncClient:
+    st = _state()
+    if st.get("http") is None:
+        st["http"] = httpx.AsyncClient(http2=True, timeout=30, follow_redirects=True, headers=_HTTP_HEADERS)
+    return st["http"]
+
+async def _get_context():
+    st = _state()
+    async with st["lock"]:
+        ctx = st.get("ctx")
+        if ctx is None or not st["browser"].is_connected():
+            pw = st.get("pw") or await async_playwright().start()
+            browser = await pw.chromium.launch(headless=PW_HEADLESS)
+            ctx = await browser.new_context(storage_state=_saved_state())
+            await ctx.route(_BLOCKED_RE, _block_heavy)
+            st.update(pw=pw, browser=browser, ctx=ctx)
+    return ctx
+
+async def _close_state(st: Dict[str, Any]):
+    if PW_STATE_PATH and st.get("ctx") is not None:
+        try:
+            os.makedirs(os.path.dirname(PW_STATE_PATH) or ".", exist_ok=True)
+            await st["ctx"].storage_state(path=PW_STATE_PATH)
+        except Exception as e:
+            _log(f"WORKDAY_PW_DEBUG could not save storage state: {e}")
+    for key, close in (("http", "aclose"), ("ctx", "close"), ("browser", "close"), ("pw", "stop")):
+        obj = st.pop(key, None)
+        if obj is not None:
+            try:
+                await getattr(obj, close)()
+            except Exception:
+                pass
+
+def _entries(values) -> List[str]:
+    # Tolerate a bare string and blank/non-string entries from hand-written YAML.
+    if isinstance(values, str):
+        values = [values]
+    return [v.strip() for v in values or () if isinstance(v, str) and v.strip()]
+
+async def fetch_async(company: Dict) -> List[Dict]:
     """
     company.workday.hosts: [ 'umusic.wd5.myworkdayjobs.com', ... ]
     company.workday.sites: [ 'UMGUS', 'UMGUK', 'External', ... ]
     """
     cfg = company.get("workday") or {}
-    hosts = cfg.get("hosts") or []
-    sites = cfg.get("sites") or []
+    hosts = _entries(cfg.get("hosts"))
+    sites = _entries(cfg.get("sites"))
 
+    # Checked before anything touches the browser or the network: a company
+    # with nothing usable configured costs nothing.
     if not hosts or not sites:
         return []
 
+    hosts = hosts[:WD_MAX_HOSTS]
+    sites = sites[:WD_MAX_SITES]
+    # Jobs are stamped with the configured name when they're built.
+    name = company.get("name") or hosts[0].split(".")[0].upper()
+    # Most tenants answer the CXS JSON endpoint directly; Chromium is only
+    # launched when none of the (host, site) pairs do.
+    if WD_PW_DIRECT:
+        out, tried = await _fetch_direct(_http(), hosts, sites, name)
+        out = _dedupe(out)
+        if out:
+            if DEBUG:
+                _log(f"WORKDAY_PW_DEBUG {company.get('name')}: tried={orjson.dumps(tried).decode()} got={len(out)} (direct)")
+            return out
+
     out: List[Dict] = []
     tried = []
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=PW_HEADLESS)
-        context = browser.new_context()
-        for hi, host in enumerate(hosts[:WD_MAX_HOSTS]):
-            for si, site in enumerate(sites[:WD_MAX_SITES]):
-                jobs = _collect_from_site(context, host, site)
+    # Every (host, site) is its own task on the shared context, WD_WORKERS at a
+    # time; a stuck tenant doesn't hold up the others.
+    ctx = await _get_context()
+    sem = asyncio.Semaphore(WD_WORKERS)
+    won: Dict[int, int] = {}  # host index -> lowest site index that yielded jobs
+    # One page load per host gets its cookies; the host's other sites wait for it
+    # and then only hit the JSON endpoints.
+    loaded: Dict[str, asyncio.Future] = {}
+
+    async def one(hi: int, si: int, host: str, site: str):
+        async with sem:
+            if WD_EARLY_BREAK and won.get(hi, len(sites)) < si:
+                return None  # an earlier site of this host already won
+            jobs = _site_cached("pw", host, site, name)
+            if jobs is None:
+                first = host not in loaded
+                if first:
+                    loaded[host] = asyncio.get_running_loop().create_future()
+                    try:
+                        jobs = await _collect_from_site(ctx, host, site, name)
+                    finally:
+                        loaded[host].set_result(None)
+                else:
+                    await loaded[host]
+                    jobs = await _collect_from_site(ctx, host, site, name, load=False)
+                _site_store("pw", host, site, jobs)
+        if WD_EARLY_BREAK and jobs:
+            won[hi] = min(si, won.get(hi, si))
+        return jobs
+
+    keys = [(hi, si) for hi in range(len(hosts)) for si in range(len(sites))]
+    got = await asyncio.gather(*[one(hi, si, hosts[hi], sites[si]) for hi, si in keys], return_exceptions=True)
+    errors = [r for r in got if isinstance(r, Exception)]
+    for e in errors:
+        _log(f"WORKDAY_PW_DEBUG worker error: {e}")
+    if errors and len(errors) == len(got):
+        raise errors[0]  # nothing worked (e.g. Chromium missing): let the caller report it
+    results = {k: r for k, r in zip(keys, got) if isinstance(r, list)}
+
+    # Same result as the old sequential walk: per host, sites in order, stopping
+    # at the first that yields jobs when WD_EARLY_BREAK is on.
+    for hi, host in enumerate(hosts):
+        for si, site in enumerate(sites):
+            if (hi, si) not in results:
+                continue
+            jobs = results[(hi, si)]
+            if DEBUG:
                 tried.append({"host": host, "site": site, "url": f"https://{host}/wday/cxs/{host.split('.')[0]}/{site}", "status": "ok", "items": len(jobs)})
-                out.extend(jobs)
-                if WD_EARLY_BREAK and jobs:
-                    # stop after the first site that yields results
-                    break
-        browser.close()
+            out.extend(jobs)
+            if WD_EARLY_BREAK and jobs:
+                break
 
-    _log(f"WORKDAY_PW_DEBUG {company.get('name')}: tried={tried} got={len(out)}")
+    out = _dedupe(out)
+    if DEBUG:
+        _log(f"WORKDAY_PW_DEBUG {company.get('name')}: tried={orjson.dumps(tried).decode()} got={len(out)}")
     return out
+
+# Sync callers get one long-lived loop per thread, so the browser launched for
+# the first company is reused for the rest instead of relaunched per call.
+_LOCAL = threading.local()
+_LOOPS: List[asyncio.AbstractEventLoop] = []
+
+def _loop() -> asyncio.AbstractEventLoop:
+    loop = getattr(_LOCAL, "loop", None)
+    if loop is None:
+        loop = _LOCAL.loop = asyncio.new_event_loop()
+        _LOOPS.append(loop)
+    return loop
+
+@atexit.register
+def _shutdown():
+    for loop in _LOOPS:
+        st = _STATE.get(loop)
+        try:
+            if st:
+                loop.run_until_complete(_close_state(st))
+            loop.close()
+        except Exception:
+            pass
+
+def fetch(company: Dict) -> List[Dict]:
+    return _loop().run_until_complete(fetch_async(company))
@@ -1,33 +1,119 @@
 # adapters/workday_pw_gql.py
-import os, json
-from typing import List, Dict, Any, Optional
-from playwright.sync_api import sync_playwright, APIResponse
+import os
+import re
+import asyncio
+import atexit
+import time
+import hashlib
+import threading
+import zlib
+import functools
+from collections import deque
+import httpx
+import orjson
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+from playwright.async_api import async_playwright, APIResponse
 
 WD_LIMIT         = int(os.getenv("WD_LIMIT", "200"))
 WD_MAX_HOSTS     = int(os.getenv("WD_MAX_HOSTS", "2"))
 WD_MAX_SITES     = int(os.getenv("WD_MAX_SITES", "6"))
 PW_HEADLESS      = os.getenv("PW_HEADLESS", "1") == "1"
 DEBUG            = os.getenv("WORKDAY_PW_DEBUG", "0") == "1"
+WD_PW_CONCURRENCY = int(os.getenv("WD_PW_CONCURRENCY", "5"))
+WD_EARLY_BREAK   = os.getenv("WD_EARLY_BREAK", "1") == "1"  # stop at the first (host, site) with jobs
+# Items per (host, site) are kept on disk this long, so a re-run within the
+# window skips the network entirely; an empty dir or a TTL of 0 turns it off.
+WD_GQL_CACHE_DIR = os.getenv("WD_GQL_CACHE_DIR", ".cache/workday_gql")
+WD_GQL_CACHE_TTL = int(os.getenv("WD_GQL_CACHE_TTL", "900"))
+WD_KEEP_RAW      = os.getenv("WD_KEEP_RAW", "0") == "1"  # attach the source node as job["raw"] (zlib'd JSON; see raw_node)
+
+# The warm-up goto only needs the document (for cookies); skip everything heavy,
+# plus the analytics/consent third parties the Workday SPA pulls in.
+_BLOCKED_EXTS    = ("png", "jpe?g", "gif", "svg", "webp", "ico", "woff2?", "ttf", "otf", "eot", "css", "mp4", "webm")
+_BLOCKED_DOMAINS = ("google-analytics", "googletagmanager", "doubleclick", "segment.io", "fullstory", "cookielaw", "onetrust")
+# Matched driver-side (see workday_pw), so the handler only ever aborts.
+_BLOCKED_RE = re.compile(r"\.(?:%s)(?:[?#]|$)|%s" % ("|".join(_BLOCKED_EXTS), "|".join(map(re.escape, _BLOCKED_DOMAINS))), re.I)
+
+async def _block_heavy(route):
+    await route.abort()
+
+# Sites of one tenant often fall through to the same board and return the
+# very same body; key parsed items by a digest of the bytes so it's parsed once.
+_PAYLOAD_CACHE: Dict[bytes, list] = {}
+_PAYLOAD_CACHE_MAX = 128
+
+def _parse_items(body: bytes) -> list[dict]:
+    key = hashlib.blake2b(body, digest_size=16).digest()
+    items = _PAYLOAD_CACHE.get(key)
+    if items is None:
+        items = _extract_items(orjson.loads(body))
+        if len(_PAYLOAD_CACHE) >= _PAYLOAD_CACHE_MAX:
+            _PAYLOAD_CACHE.pop(next(iter(_PAYLOAD_CACHE)))
+        _PAYLOAD_CACHE[key] = items
+    return items
+
+def _cache_path(host: str, site: str) -> str:
+    key = hashlib.sha256(f"{host}|{site}|workday".encode()).hexdigest()[:32]
+    return os.path.join(WD_GQL_CACHE_DIR, key + ".json")
+
+def _cache_get(host: str, site: str) -> Optional[list]:
+    if not (WD_GQL_CACHE_DIR and WD_GQL_CACHE_TTL):
+        return None
+    path = _cache_path(host, site)
+    try:
+        if time.time() - os.path.getmtime(path) >= WD_GQL_CACHE_TTL:
+            return None
+        with open(path, "rb") as f:
+            items = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    return items if isinstance(items, list) else None
+
+def _cache_put(host: str, site: str, items: list):
+    # Empty answers aren't kept: a blocked or flaky POST shouldn't stick for the TTL.
+    if not (WD_GQL_CACHE_DIR and WD_GQL_CACHE_TTL and items):
+        return
+    path = _cache_path(host, site)
+    try:
+        os.makedirs(WD_GQL_CACHE_DIR, exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            f.write(orjson.dumps(items))
+        os.replace(path + ".tmp", path)
+    except OSError as e:
+        _dbg(f"WORKDAY_PW_DEBUG cache write {path}: {e}")
 
 def _dbg(msg: str):
     if DEBUG:
         print(msg, flush=True)
 
-def _norm(s: Optional[str]) -> str:
-    return (s or "").strip()
+def _norm(s: Any) -> str:
+    if type(s) is str: return s.strip()
+    return "" if s is None else str(s).strip()
 
 def _extract_items(payload: Dict[str, Any]) -> list[dict]:
     """
     Extract items from Workday GraphQL response.
     """
-    try:
-        data = payload.get("data") or {}
-        js = data.get("jobSearch") or {}
-        items = js.get("items") or []
-        if isinstance(items, list):
-            return items
-    except Exception:
-        pass
+    data = payload.get("data") if type(payload) is dict else None
+    if type(data) is not dict:
+        return []
+    site = data.get("site")
+    for js in (data.get("jobSearch"), site.get("jobSearch") if type(site) is dict else None):
+        if type(js) is dict and type(js.get("items")) is list:
+            return js["items"]
+    # Anything else: breadth-first, so a shallow jobSearch is found before the
+    # scan wanders into large nested arrays; stop at the first one with items.
+    # Repeated bodies never get here twice (see _parse_items).
+    queue = deque((data,))
+    while queue:
+        o = queue.popleft()
+        if type(o) is dict:
+            js = o.get("jobSearch")
+            if type(js) is dict and type(js.get("items")) is list:
+                return js["items"]
+            queue.extend(o.values())
+        elif type(o) is list:
+            queue.extend(o)
     return []
 
 def _build_job(company: str, host: str, tenant: str, site: str, node: dict) -> dict:
@@ -37,7 +123,7 @@ def _build_job(company: str, host: str, tenant: str, site: str, node: dict) -> d
     loc  = node.get("locationsText") or ", ".join(
         [l.get("name","") for l in (node.get("locations") or []) if isinstance(l, dict)]
     )
-    return {
+    job = {
         "company": company,
         "source": "workday_gql",
         "title": title,
@@ -45,8 +131,19 @@ def _build_job(company: str, host: str, tenant: str, site: str, node: dict) -> d
         "location": _norm(loc),
         "department": "",
         "date_posted": node.get("postedOn") or "",
-        "raw": node,
     }
+    if WD_KEEP_RAW:
+        job["raw"] = zlib.compress(orjson.dumps(node), 1)
+    return job
+
+@functools.lru_cache(maxsize=256)
+def _inflate(blob: bytes) -> dict:
+    return orjson.loads(zlib.decompress(blob))
+
+def raw_node(job: dict) -> Optional[dict]:
+    """The Workday node a job was built from (only kept with WD_KEEP_RAW=1)."""
+    blob = job.get("raw")
+    return _inflate(blob) if isinstance(blob, bytes) else blob
 
 GQL_QUERY = """
 query jobSearch($limit:Int,$offset:Int,$activeOnly:Boolean){
@@ -62,28 +159,135 @@ query jobSearch($limit:Int,$offset:Int,$activeOnly:Boolean){
 }
 """
 
-def _post_jobs(ctx_request, url_gql: str, headers: dict) -> list[dict]:
-    payload = {
-        "operationName": "jobSearch",
-        "variables": {"limit": 200, "offset": 0, "activeOnly": True},
-        "query": GQL_QUERY,
-    }
+# Statuses that mean the tenant wants a browser session (cookies) first.
+_NEEDS_SESSION = frozenset((401, 403, 419))
+
+_BODY = orjson.dumps({
+    "operationName": "jobSearch",
+    "variables": {"limit": 200, "offset": 0, "activeOnly": True},
+    "query": GQL_QUERY,
+})
+
+# Plain HTTP client for the common case; Chromium only starts for tenants that
+# refuse a cookie-less POST.
+_UA = ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+       "(KHTML, like Gecko) Chrome/124.0.0.0 Safari/537.36")
+
+async def _post_direct(client: httpx.AsyncClient, url_gql: str, headers: dict) -> Tuple[int, list[dict]]:
     try:
-        resp: APIResponse = ctx_request.post(url_gql, data=json.dumps(payload),
-                                             headers=headers, timeout=30000)
+        resp = await client.post(url_gql, content=_BODY, headers=headers)
+        if resp.status_code != 200:
+            _dbg(f"WORKDAY_PW_DEBUG POST {url_gql} -> {resp.status_code} (direct)")
+            return resp.status_code, []
+        items = _parse_items(resp.content)
+        _dbg(f"WORKDAY_PW_DEBUG POST {url_gql} -> items={len(items)} (direct)")
+        return resp.status_code, items
+    except Exception as e:
+        _dbg(f"WORKDAY_PW_DEBUG error POST {url_gql} (direct): {e}")
+        return 0, []
+
+async def _post_jobs(ctx_request, url_gql: str, headers: dict) -> Tuple[int, list[dict]]:
+    try:
+        resp: APIResponse = await ctx_request.post(url_gql, data=_BODY, headers=headers, timeout=30000)
         if not resp.ok:
             _dbg(f"WORKDAY_PW_DEBUG POST {url_gql} -> {resp.status}")
-            return []
-        data = resp.json()
-        items = _extract_items(data)
+            return resp.status, []
+        items = _parse_items(await resp.body())
         _dbg(f"WORKDAY_PW_DEBUG POST {url_gql} -> items={len(items)}")
-        return items
+        return resp.status, items
     except Exception as e:
         _dbg(f"WORKDAY_PW_DEBUG error POST {url_gql}: {e}")
-        return []
+        return 0, []
 
-def fetch(company_cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
+# One long-lived loop + AsyncClient + browser session per thread: all three are
+# bound to the loop they first ran on, and keeping them lets connections,
+# Chromium and its tenant cookies carry over between companies.
+_LOCAL = threading.local()
+_LOCALS: List[threading.local] = []
+
+def _loop() -> asyncio.AbstractEventLoop:
+    if getattr(_LOCAL, "loop", None) is None:
+        _LOCAL.loop = asyncio.new_event_loop()
+        _LOCAL.http = httpx.AsyncClient(http2=True, timeout=30, follow_redirects=True,
+                                        headers={"User-Agent": _UA},
+                                        limits=httpx.Limits(max_connections=20, max_keepalive_connections=10))
+        _LOCAL.session = _Session()
+        _LOCALS.append(_LOCAL.__dict__)
+    return _LOCAL.loop
+
+@atexit.register
+def _shutdown():
+    for st in _LOCALS:
+        try:
+            st["loop"].run_until_complete(st["session"].close())
+            st["loop"].run_until_complete(st["http"].aclose())
+            st["loop"].close()
+        except Exception:
+            pass
+
+class _Session:
+    """Browser context opened on first need and kept for later companies; warmed once per host."""
+
+    def __init__(self):
+        self.pw = self.browser = self.ctx = None
+        self.lock = asyncio.Lock()
+        self.warming: Dict[str, asyncio.Task] = {}
+
+    async def _open(self):
+        async with self.lock:
+            if self.ctx is None or not self.browser.is_connected():
+                self.warming = {}  # a fresh browser has none of the old cookies
+                self.pw = self.pw or await async_playwright().start()
+                self.browser = await self.pw.chromium.launch(headless=PW_HEADLESS)
+                self.ctx = await self.browser.new_context()
+                await self.ctx.route(_BLOCKED_RE, _block_heavy)
+
+    async def _warm(self, url_page: str):
+        # Cookies are tenant-scoped: one warm-up load per host.
+        page = await self.ctx.new_page()
+        try:
+            await page.goto(url_page, wait_until="domcontentloaded", timeout=20000)
+        except Exception as e:
+            _dbg(f"WORKDAY_PW_DEBUG warm {url_page}: {e}")
+        finally:
+            await page.close()
+
+    def warmed(self, host: str) -> bool:
+        return host in self.warming
+
+    async def request(self, host: str, url_page: str):
+        await self._open()
+        if host not in self.warming:
+            self.warming[host] = asyncio.ensure_future(self._warm(url_page))
+        await asyncio.shield(self.warming[host])
+        return self.ctx.request
+
+    async def close(self):
+        for t in self.warming.values():
+            t.cancel()
+        await asyncio.gather(*self.warming.values(), return_exceptions=True)
+        for obj, close in ((self.ctx, "close"), (self.browser, "close"), (self.pw, "stop")):
+            if obj is not None:
+                try:
+                    await getattr(obj, close)()
+                except Exception:
+                    pass
+
+def _first_of_each(values: List[str]) -> List[str]:
+    # Config lists often repeat a host or differ only in a site's case; probe each once.
+    seen: Dict[str, str] = {}
+    for v in values:
+        seen.setdefault(v.lower(), v)
+    return list(seen.values())
+
+def iter_jobs(company_cfg: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
     """
+    Every (host, site) POST is scheduled up front and runs concurrently
+    (WD_PW_CONCURRENCY at a time); jobs are still yielded site by site in
+    host/site order as each one lands. Stops at WD_LIMIT, or (WD_EARLY_BREAK)
+    after the first pair with jobs, skipping later pairs not yet started.
+    Chromium is only launched if some host refuses the plain-HTTP POST.
+
     company_cfg needs:
       - name
       - ats: workday_pw_gql
@@ -91,51 +295,81 @@ def fetch(company_cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
       - workday_pw_sites
     """
     name  = company_cfg.get("name", "WorkdayCompany")
-    hosts = (company_cfg.get("workday_pw_hosts") or [])[:WD_MAX_HOSTS]
-    sites = (company_cfg.get("workday_pw_sites") or [])[:WD_MAX_SITES]
+    hosts = _first_of_each(company_cfg.get("workday_pw_hosts") or [])[:WD_MAX_HOSTS]
+    sites = _first_of_each(company_cfg.get("workday_pw_sites") or [])[:WD_MAX_SITES]
 
-    gathered, tried_meta = [], []
+    loop = _loop()
+    client: httpx.AsyncClient = _LOCAL.http
+    sem = asyncio.Semaphore(WD_PW_CONCURRENCY)
+    session: _Session = _LOCAL.session
+    count, tried_meta = 0, []
+    seen = set()  # externalPath: the same posting shows up on several shards/sites
 
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=PW_HEADLESS)
-        ctx = browser.new_context()
-        page = ctx.new_page()
+    won = [len(hosts) * len(sites)]  # lowest pair index that returned jobs
 
-        for host in hosts:
-            tenant = host.split(".")[0]
-            origin = f"https://{host}"
-            for site in sites:
-                url_page = f"{origin}/wday/cxs/{tenant}/{site}"
-                url_gql  = f"{url_page}/graphql"
+    async def one(idx: int, host: str, site: str, headers: dict):
+        url_page = f"https://{host}/wday/cxs/{host.split('.')[0]}/{site}"
+        url_gql  = f"{url_page}/graphql"
+        items = _cache_get(host, site)
+        if items is not None:
+            return url_gql, "cache", items
+        async with sem:
+            if WD_EARLY_BREAK and won[0] < idx:
+                return url_gql, "skipped", []  # an earlier pair already has the jobs
+            # Most tenants answer CXS without a session, so POST over plain HTTP
+            # first; only hosts that ask for one (401/403/419) go through the browser.
+            if session.warmed(host):
+                status, items = await _post_jobs(await session.request(host, url_page), url_gql, headers)
+            else:
+                status, items = await _post_direct(client, url_gql, headers)
+                if status in _NEEDS_SESSION:
+                    status, items = await _post_jobs(await session.request(host, url_page), url_gql, headers)
+        if status == 200:
+            _cache_put(host, site, items)
+            if items:
+                won[0] = min(won[0], idx)
+        return url_gql, status, items
 
-                try:
-                    page.goto(url_page, wait_until="domcontentloaded", timeout=20000)
-                except Exception as e:
-                    _dbg(f"WORKDAY_PW_DEBUG warm {url_page}: {e}")
-
-                headers = {
-                    "Content-Type": "application/json",
-                    "Accept": "application/json, text/plain, */*",
-                    "Referer": url_page,
-                    "Origin": origin,
-                    "X-Requested-With": "XMLHttpRequest",
-                    "Workday-Client": "workday+cxs",
-                }
-
-                items = _post_jobs(ctx.request, url_gql, headers)
-                jobs  = [_build_job(name, host, tenant, site, n) for n in items]
-                tried_meta.append({"host": host, "site": site, "url": url_gql, "status": "ok", "items": len(jobs)})
-                gathered.extend(jobs)
-
-                if WD_LIMIT and len(gathered) >= WD_LIMIT:
-                    gathered = gathered[:WD_LIMIT]
-                    break
-            if WD_LIMIT and len(gathered) >= WD_LIMIT:
-                break
-
-        ctx.close()
-        browser.close()
+    tasks = []
+    for host in hosts:
+        headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json, text/plain, */*",
+            "Referer": f"https://{host}/wday/cxs/{host.split('.')[0]}/{sites[0]}" if sites else f"https://{host}/",
+            "Origin": f"https://{host}",
+            "X-Requested-With": "XMLHttpRequest",
+            "Workday-Client": "workday+cxs",
+        }
+        base = len(tasks)
+        tasks.extend((host, site, loop.create_task(one(base + i, host, site, headers)))
+                     for i, site in enumerate(sites))
 
-    if DEBUG:
-        print(f"WORKDAY_PW_DEBUG {name}: tried={tried_meta} got={len(gathered)}", flush=True)
-    return gathered
\ No newline at end of file
+    try:
+        for host, site, task in tasks:
+            url_gql, status, items = loop.run_until_complete(task)
+            if DEBUG:
+                tried_meta.append({"host": host, "site": site, "url": url_gql, "status": status, "items": len(items)})
+            tenant = host.split(".")[0]
+            for n in items:
+                path = n.get("externalPath")
+                if path:
+                    if path in seen:
+                        continue
+                    seen.add(path)
+                count += 1
+                yield _build_job(name, host, tenant, site, n)
+                if WD_LIMIT and count >= WD_LIMIT:
+                    return
+            if WD_EARLY_BREAK and items:
+                return
+    finally:
+        pending = [t for _, _, t in tasks if not t.done()]
+        for task in pending:
+            task.cancel()
+        if pending:
+            loop.run_until_complete(asyncio.gather(*pending, return_exceptions=True))
+        if DEBUG:
+            print(f"WORKDAY_PW_DEBUG {name}: tried={orjson.dumps(tried_meta).decode()} got={count} browser={session.ctx is not None}", flush=True)
+
+def fetch(company_cfg: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return list(iter_jobs(company_cfg))
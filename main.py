@@ -1,4 +1,6 @@
-import os, yaml, datetime as dt
+import os, yaml, functools, datetime as dt
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from jinja2 import Environment, FileSystemLoader
 from email.utils import formatdate
 from email.mime.text import MIMEText
@@ -7,6 +9,7 @@ import smtplib
 from vendors.normalize import normalize
 from vendors.dedupe import dedupe
 from vendors.filters import filter_jobs_with_debug
+from vendors import cache
 
 from adapters import (
     lever,
@@ -22,7 +25,8 @@ from adapters import (
     workday_pw,
 )
 
-# Map ATS string -> adapter module
+# Map ATS string -> adapter module. Keys are canonical (see _ats_key), so
+# "Workday-PW" in a config finds "workday_pw" without an alias entry.
 ADAPTERS = {
     "lever":           lever,
     "greenhouse":      greenhouse,
@@ -31,19 +35,46 @@ ADAPTERS = {
     "workday":         workday,
     "workday_gql":     workday_gql,
     "workday_pw":      workday_pw,
-    "workday-pw":      workday_pw,   # alias
     "smartrecruiters": smartrecruiters,
     "rss":             rss,
     "randstad_it":     randstad_it,
     "adecco_it":       adecco_it,
 }
 
-def send_email(html):
+# Adapters that drive Chromium. Each worker thread keeps its own browser, so these
+# get a small pool of their own instead of a slot in the general one.
+BROWSER_ADAPTERS = {workday_pw}
+
+SCOUT_CONCURRENCY    = int(os.getenv("SCOUT_CONCURRENCY", "8"))
+SCOUT_PW_CONCURRENCY = int(os.getenv("SCOUT_PW_CONCURRENCY", "2"))
+
+# libyaml's loader when PyYAML was built with it; same safe subset, much faster.
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+@functools.lru_cache(maxsize=4)
+def _load_yaml(path, mtime):
+    with open(path, encoding="utf-8") as f:
+        return yaml.load(f, Loader=_YAML_LOADER)
+
+def load_yaml(path):
+    # Keyed on mtime too, so an edited config is picked up by the next run().
+    return _load_yaml(path, os.path.getmtime(path))
+
+def _ats_key(ats):
+    return (ats or "").strip().lower().replace("-", "_")
+
+@functools.lru_cache(maxsize=1)
+def _template():
+    env = Environment(loader=FileSystemLoader("outputs/templates"), auto_reload=False)
+    return env.get_template("daily_report.html.j2")
+
+def send_email(report_path):
     host=os.getenv("SMTP_HOST"); port=int(os.getenv("SMTP_PORT","587"))
     user=os.getenv("SMTP_USER"); pwd=os.getenv("SMTP_PASS"); to=os.getenv("EMAIL_TO")
     if not (host and user and pwd and to):
         print("EMAIL: missing SMTP_* or EMAIL_TO; skipping email")
         return
+    with open(report_path, encoding="utf-8") as f: html = f.read()
     msg = MIMEText(html, "html", "utf-8")
     msg["Subject"] = "Job Scout — Daily Report"
     msg["From"] = user; msg["To"] = to; msg["Date"]=formatdate(localtime=True)
@@ -52,38 +83,76 @@ def send_email(html):
     print("EMAIL: sent")
 
 def render_html(jobs, outpath):
-    env = Environment(loader=FileSystemLoader("outputs/templates"))
-    tpl = env.get_template("daily_report.html.j2")
+    tpl = _template()
     ts = dt.datetime.now().isoformat(timespec="seconds")
-    html = tpl.render(generated_at=ts, total=len(jobs), jobs=jobs)
     os.makedirs(os.path.dirname(outpath), exist_ok=True)
-    with open(outpath, "w", encoding="utf-8") as f: f.write(html)
+    # Streamed straight to disk: rows are written as they render, never joined in memory.
+    tpl.stream(generated_at=ts, total=len(jobs), jobs=jobs).dump(outpath, encoding="utf-8")
     print(f"WROTE: {outpath}")
-    return html
+    return outpath
 
 def run(companies_file, keywords_file, outpath):
-    companies = yaml.safe_load(open(companies_file, encoding="utf-8"))
-    kw = yaml.safe_load(open(keywords_file, encoding="utf-8"))
+    companies = load_yaml(companies_file)
+    kw = load_yaml(keywords_file)
     targets = companies.get("targets", [])
 
     skip_filters = (os.getenv("SKIP_FILTERS", "").strip().lower() in {"1", "true", "yes", "on"})
 
     print(f"FUNNEL: companies_loaded={len(targets)}")
 
+    # Companies are grouped by adapter once; an adapter with a batch entry point
+    # (fetch_many_sync) gets all of its companies in one call, sharing one client.
+    groups = defaultdict(list)
+    skipped = []
+    results = {}
+    for i, c in enumerate(targets):
+        # A shallow copy carries the canonical key, so adapters checking
+        # company["ats"] see it while the (cached) loaded config stays untouched.
+        c = {**c, "ats": _ats_key(c.get("ats"))}
+        adapter = ADAPTERS.get(c["ats"])
+        if adapter is None:
+            skipped.append(f"{c.get('name')} ({c['ats']})"); continue
+        jobs = cache.get(c)
+        if jobs is not None:
+            results[i] = jobs
+            print(f"FETCH: company={c['name']} adapter={c['ats']} jobs={len(jobs)} (cached)")
+            continue
+        groups[adapter].append((i, c))
+    if skipped:
+        print("SKIP unsupported ats:", ", ".join(skipped))
+
+    # Fetches are network-bound, so they overlap; jobs are still merged in config
+    # order so dedupe keeps the same first copy as a sequential run would.
+    with ThreadPoolExecutor(max_workers=SCOUT_CONCURRENCY) as pool, \
+         ThreadPoolExecutor(max_workers=SCOUT_PW_CONCURRENCY) as pw_pool:
+        futures = {}
+        for adapter, members in groups.items():
+            ex = pw_pool if adapter in BROWSER_ADAPTERS else pool
+            batch = getattr(adapter, "fetch_many_sync", None)
+            if batch is not None and len(members) > 1:
+                futures[ex.submit(batch, [c for _, c in members])] = (members, True)
+            else:
+                for m in members:
+                    futures[ex.submit(adapter.fetch, m[1])] = ([m], False)
+        for fut in as_completed(futures):
+            members, batched = futures[fut]
+            try:
+                got = fut.result()
+            except Exception as e:
+                for _, c in members:
+                    print("ERROR", c.get("name"), e)
+                continue
+            for (i, c), jobs in zip(members, got if batched else [got]):
+                results[i] = jobs
+                cache.put(c, jobs)
+                print(f"FETCH: company={c['name']} adapter={c['ats']} jobs={len(jobs)}")
+
     all_jobs=[]
-    for c in targets:
-        ats = c.get("ats")
-        adapter = ADAPTERS.get(ats)
-        if not adapter:
-            print("SKIP", c.get("name"), "unsupported ats:", ats); continue
-        try:
-            jobs = adapter.fetch(c)
-            all_jobs.extend(jobs)
-            print(f"FETCH: company={c['name']} adapter={ats} jobs={len(jobs)}")
-        except Exception as e:
-            print("ERROR", c.get("name"), e)
+    for i in sorted(results):
+        all_jobs.extend(results[i])
 
     print(f"FUNNEL: total_fetched_before_normalize={len(all_jobs)}")
+
     all_jobs = normalize(all_jobs)
     print(f"FUNNEL: total_before_filtering={len(all_jobs)}")
 
@@ -118,8 +187,7 @@ def run(companies_file, keywords_file, outpath):
     all_jobs = dedupe(all_jobs)
     print(f"FUNNEL: total_after_dedupe={len(all_jobs)}")
 
-    html = render_html(all_jobs, outpath)
-    send_email(html)
+    send_email(render_html(all_jobs, outpath))
 
 if __name__ == "__main__":
     import argparse
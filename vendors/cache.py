@@ -0,0 +1,48 @@
+import os, time, hashlib
+import orjson
+
+# Per-company fetch results, one file each, reused while younger than the TTL.
+# Keyed on the whole company entry, so editing its hosts/sites/slug misses.
+# Off unless SCOUT_CACHE_TTL is set (seconds), so a plain re-run always fetches.
+SCOUT_CACHE_DIR = os.getenv("SCOUT_CACHE_DIR", ".cache/scout")
+SCOUT_CACHE_TTL = int(os.getenv("SCOUT_CACHE_TTL", "0"))
+
+def _path(company):
+    # A company entry orjson can't key on (odd YAML keys etc.) just isn't cached.
+    try:
+        raw = orjson.dumps(company, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS, default=str)
+    except TypeError:  # orjson.JSONEncodeError
+        return None
+    return os.path.join(SCOUT_CACHE_DIR, hashlib.sha256(raw).hexdigest()[:32] + ".json")
+
+def get(company):
+    if not (SCOUT_CACHE_DIR and SCOUT_CACHE_TTL):
+        return None
+    path = _path(company)
+    if path is None:
+        return None
+    try:
+        if time.time() - os.path.getmtime(path) >= SCOUT_CACHE_TTL:
+            return None
+        with open(path, "rb") as f:
+            jobs = orjson.loads(f.read())
+    except (OSError, orjson.JSONDecodeError):
+        return None
+    return jobs if isinstance(jobs, list) else None
+
+def put(company, jobs):
+    # Empty results aren't kept: most adapters return [] on a failed request too,
+    # and that shouldn't stick for a whole TTL.
+    if not (SCOUT_CACHE_DIR and SCOUT_CACHE_TTL and jobs):
+        return
+    path = _path(company)
+    if path is None:
+        return
+    try:
+        data = orjson.dumps(jobs)
+        os.makedirs(SCOUT_CACHE_DIR, exist_ok=True)
+        with open(path + ".tmp", "wb") as f:
+            f.write(data)
+        os.replace(path + ".tmp", path)
+    except (OSError, TypeError) as e:  # TypeError: a job field orjson can't encode
+        print("CACHE: could not write", path, e)
@@ -1,4 +1,4 @@
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
 
 def dedupe(jobs):
     seen = set()
@@ -10,13 +10,22 @@ def dedupe(jobs):
         seen.add(key)
         unique.append(j)
 
+    # Only jobs with the same company and location can be duplicates, so each
+    # title is scored against its (company, location) bucket, not every kept job,
+    # in one extractOne call so the per-pair loop runs in C++. A title already
+    # kept verbatim (the same posting from another source) scores 100 anyway,
+    # so that case is a set lookup.
     final=[]
+    buckets = {}
+    exact = set()
     for j in unique:
-        dup=False
-        for k in final:
-            if j["company"]==k["company"]:
-                if fuzz.WRatio((j.get("title") or ""), (k.get("title") or "")) >= 92:
-                    if (j.get("location") or "") == (k.get("location") or ""):
-                        dup=True; break
-        if not dup: final.append(j)
+        title = j.get("title") or ""
+        where = (j["company"], j.get("location") or "")
+        if title and (where, title) in exact:
+            continue
+        bucket = buckets.setdefault(where, [])
+        if not title or not bucket or process.extractOne(title, bucket, scorer=fuzz.WRatio, score_cutoff=92) is None:
+            bucket.append(title)
+            exact.add((where, title))
+            final.append(j)
     return final
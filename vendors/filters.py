@@ -2,17 +2,20 @@
 from __future__ import annotations
 
 import datetime as dt
+import functools
 from collections import Counter
+from operator import itemgetter
 from typing import List, Dict, Any
 
 from dateutil import parser
 
-DEFAULT_REMOTE_TERMS = [
+# Tuples, already lowercase: used as-is when the config doesn't override them.
+DEFAULT_REMOTE_TERMS = (
     "remote", "hybrid", "work from anywhere", "distributed", "remoto", "da remoto",
     "telelavoro", "home office", "work-from-home", "wfh",
-]
+)
 
-DEFAULT_EMEA_TERMS = [
+DEFAULT_EMEA_TERMS = (
     "europe", "emea", "uk", "united kingdom", "ireland", "italy", "italia",
     "germany", "deutschland", "france", "spain", "portugal", "netherlands",
     "belgium", "austria", "sweden", "norway", "denmark", "finland",
@@ -20,55 +23,84 @@ DEFAULT_EMEA_TERMS = [
     "greece", "cyprus", "malta", "estonia", "latvia", "lithuania", "hungary",
     "slovenia", "croatia", "serbia", "bosnia", "montenegro", "albania",
     "macedonia", "moldova", "ukraine", "georgia", "armenia",
-]
+)
+
+# Title hints that bump a job's score (substring match, lowercase).
+_MUSIC_HINTS = ("music", "audio", "catalog", "metadata", "royalties", "licensing")
 
 
 def _text(s: Any) -> str:
     return (s or "").strip()
 
 
+@functools.lru_cache(maxsize=256)
+def _lowered(needles: tuple) -> tuple:
+    # Keyword lists come from config and repeat for every job: lower them once.
+    # Duplicates are kept, since _score counts each listed keyword.
+    return tuple((n or "").lower() for n in needles)
+
+
 def _has_any(text: str, needles: list[str]) -> bool:
     if not text or not needles:
         return False
-    t = text.lower()
-    return any((n or "").lower() in t for n in needles)
+    return _has_any_lc(text.lower(), needles)
 
 
-def _has_any_location_term(text: str, needles: list[str]) -> bool:
-    """
-    Safer location matching:
-    - for very short alpha terms (e.g. "US", "UK"), match as whole tokens
-    - otherwise keep substring behavior for flexibility
-    """
-    if not text or not needles:
+def _has_any_lc(t: str, needles: list[str]) -> bool:
+    """_has_any for text the caller has already lowercased."""
+    if not t or not needles:
         return False
+    return any(n in t for n in _lowered(tuple(needles)))
+
+
+def _terms(custom: list | None, default: tuple) -> tuple:
+    """Lowered config terms, or the (already lowered) default tuple."""
+    return _lowered(tuple(custom)) if custom else default
 
-    t = f" {text.lower()} "
+
+@functools.lru_cache(maxsize=64)
+def _location_terms(needles: tuple) -> tuple[frozenset, tuple]:
+    """
+    Split (and lowercase) a location term list once:
+    - very short alpha terms (e.g. "US", "UK") are matched as whole tokens
+    - everything else keeps substring behavior
+    """
+    short, other = set(), []
     for raw in needles:
         n = (raw or "").strip().lower()
         if not n:
             continue
         if len(n) <= 3 and n.isalpha():
-            if f" {n} " in t:
-                return True
-        elif n in t:
-            return True
-    return False
+            short.add(n)
+        else:
+            other.append(n)
+    return frozenset(short), tuple(other)
 
 
-def _company_kw(job: dict, kw: dict) -> dict:
+def _has_any_location_term(text: str, needles: list[str]) -> bool:
     """
-    Return company-specific keyword config (e.g. Sony Music) if defined.
+    Safer location matching: short terms as whole (space-delimited) tokens,
+    the rest as substrings. See _location_terms.
     """
-    companies = kw.get("companies") or {}
-    company = _text(job.get("company"))
-    if not company or not companies:
-        return {}
-    for name, cfg in companies.items():
-        # strict match to avoid accidental substring matches
-        if company.lower().strip() == name.lower().strip():
-            return cfg or {}
-    return {}
+    if not text or not needles:
+        return False
+
+    short, other = _location_terms(tuple(needles))
+    t = text.lower()
+    if short and not short.isdisjoint(t.split(" ")):
+        return True
+    return any(n in t for n in other)
+
+
+def _company_index(kw: dict) -> dict:
+    """
+    Company-specific keyword configs (e.g. Sony Music) keyed by lowercased name.
+    """
+    index: dict = {}
+    for name, cfg in (kw.get("companies") or {}).items():
+        # strict match to avoid accidental substring matches; first entry wins
+        index.setdefault(name.lower().strip(), cfg or {})
+    return index
 
 
 def _merge_kw(base: dict, override: dict) -> dict:
@@ -81,7 +113,28 @@ def _merge_kw(base: dict, override: dict) -> dict:
     return merged
 
 
-def _is_too_old(job: dict, kw: dict) -> bool:
+@functools.lru_cache(maxsize=4096)
+def _posted_dt(s: str) -> dt.datetime | None:
+    """
+    Parse posted_at (None if unparseable), naive values taken as UTC.
+    normalize() already leaves most as ISO 8601, which the C parser handles;
+    many jobs in a batch also share the same stamp, hence the cache.
+    """
+    d = None
+    if len(s) >= 10 and s[4] == "-" and s[7] == "-":
+        try:
+            d = dt.datetime.fromisoformat(s)
+        except ValueError:
+            pass
+    if d is None:
+        try:
+            d = parser.parse(s)
+        except Exception:
+            return None
+    return d if d.tzinfo else d.replace(tzinfo=dt.timezone.utc)
+
+
+def _is_too_old(job: dict, kw: dict, now: dt.datetime | None = None) -> bool:
     """
     Drop listings older than max_age_days, but DO NOT drop if posted_at is missing.
     Default max_age_days is 30 if not specified.
@@ -95,17 +148,12 @@ def _is_too_old(job: dict, kw: dict) -> bool:
         # No posted date -> keep the job
         return False
 
-    try:
-        posted_dt = parser.parse(str(posted_at))
-    except Exception:
+    posted_dt = _posted_dt(str(posted_at))
+    if posted_dt is None:
         # Unparseable date -> keep the job
         return False
 
-    if not posted_dt.tzinfo:
-        posted_dt = posted_dt.replace(tzinfo=dt.timezone.utc)
-
-    now = dt.datetime.now(dt.timezone.utc)
-    delta = now - posted_dt
+    delta = (now or dt.datetime.now(dt.timezone.utc)) - posted_dt
     if delta.total_seconds() < 0:
         # Future date -> keep
         return False
@@ -123,6 +171,13 @@ def _location_ok(job: dict, kw: dict) -> bool:
     if not loc:
         return bool(allow_unlocated)
 
+    return _location_match(loc, tuple(allow), tuple(deny))
+
+
+@functools.lru_cache(maxsize=8192)
+def _location_match(loc: str, allow: tuple, deny: tuple) -> bool:
+    # Feeds repeat the same few location strings ("London, UK", "Remote"),
+    # so each one is matched once per allow/deny list.
     if allow and not _has_any_location_term(loc, allow):
         return False
     if deny and _has_any_location_term(loc, deny):
@@ -135,29 +190,31 @@ def _score(job: dict, kw: dict) -> float:
     title = _text(job.get("title"))
     company = _text(job.get("company"))
     location = _text(job.get("location"))
-    hay = f"{title} | {company} | {location}"
+    # Each field is lowercased once here and the keyword lists once per list
+    # (see _lowered), instead of per keyword.
+    hay = f"{title} | {company} | {location}".lower()
+    title = title.lower()
+    location = location.lower()
 
     inc = kw.get("include") or []
     exc = kw.get("exclude") or []
-    remote_terms = kw.get("remote_terms") or DEFAULT_REMOTE_TERMS
-    emea_terms = kw.get("emea_terms") or DEFAULT_EMEA_TERMS
+    remote_terms = _terms(kw.get("remote_terms"), DEFAULT_REMOTE_TERMS)
+    emea_terms = _terms(kw.get("emea_terms"), DEFAULT_EMEA_TERMS)
 
     score = 0.0
 
-    for k in inc:
-        if _has_any(hay, [k]):
-            score += 1.0
+    if inc:
+        score += sum(k in hay for k in _lowered(tuple(inc)))
 
-    for k in exc:
-        if _has_any(hay, [k]):
-            score -= 0.5
+    if exc:
+        score -= 0.5 * sum(k in hay for k in _lowered(tuple(exc)))
 
-    if _has_any(location, remote_terms):
+    if location and any(n in location for n in remote_terms):
         score += 2.0
-    if _has_any(location, emea_terms):
+    if location and any(n in location for n in emea_terms):
         score += 1.5
 
-    if _has_any(title, ["music", "audio", "catalog", "metadata", "royalties", "licensing"]):
+    if any(n in title for n in _MUSIC_HINTS):
         score += 0.5
 
     if _text(job.get("posted_at")):
@@ -187,25 +244,35 @@ def filter_jobs_with_debug(jobs: list[dict], kw: dict) -> tuple[list[dict], dict
     reasons: Counter[str] = Counter()
     examples: list[dict] = []
 
-    for j in jobs:
-        company_kw = _company_kw(j, kw)
-        kw_local = _merge_kw(kw, company_kw)
-        inc = kw_local.get("include") or []
-        exc = kw_local.get("exclude") or []
+    # Jobs come from a handful of companies: look up and merge each one's
+    # keywords once per call, not once per job.
+    index = _company_index(kw)
+    per_company: dict[str, tuple[dict, dict]] = {}
+    now = dt.datetime.now(dt.timezone.utc)
 
+    for j in jobs:
         title = _text(j.get("title"))
         company = _text(j.get("company"))
         location = _text(j.get("location"))
-        hay = f"{title} | {company} | {location}"
+
+        hit = per_company.get(company)
+        if hit is None:
+            company_kw = index.get(company.lower(), {}) if company else {}
+            # Without an override the merge would only copy kw's own lists.
+            hit = per_company[company] = (company_kw, _merge_kw(kw, company_kw) if company_kw else kw)
+        company_kw, kw_local = hit
+        inc = kw_local.get("include") or []
+        exc = kw_local.get("exclude") or []
+        hay_lc = f"{title} | {company} | {location}".lower()
 
         reject_reason = None
 
         # Only enforce include list strictly when company-specific keywords exist
-        if company_kw and inc and not _has_any(hay, inc):
+        if company_kw and inc and not _has_any_lc(hay_lc, inc):
             reject_reason = "include_miss_company_override"
-        elif exc and _has_any(hay, exc):
+        elif exc and _has_any_lc(hay_lc, exc):
             reject_reason = "exclude_match"
-        elif _is_too_old(j, kw_local):
+        elif _is_too_old(j, kw_local, now):
             reject_reason = "too_old"
         elif not _location_ok(j, kw_local):
             reject_reason = "location_blocked"
@@ -230,5 +297,5 @@ def filter_jobs_with_debug(jobs: list[dict], kw: dict) -> tuple[list[dict], dict
         jj["score"] = _score(j, kw_local)
         out.append(jj)
 
-    out.sort(key=lambda x: x.get("score", 0.0), reverse=True)
+    out.sort(key=itemgetter("score"), reverse=True)
     return out, {"reasons": dict(reasons.most_common()), "examples": examples}
@@ -1,8 +1,19 @@
+import datetime as dt
 from dateutil import parser
 
 def _norm(s):
     return s.strip() if isinstance(s,str) else s
 
+def _iso(pa):
+    # Most ATS dates are already ISO 8601 (YYYY-MM-DD...): the C parser handles
+    # those; only other shapes go through dateutil's (much slower) guesswork.
+    if len(pa) >= 10 and pa[4] == "-" and pa[7] == "-":
+        try:
+            return dt.datetime.fromisoformat(pa).isoformat()
+        except ValueError:
+            pass
+    return parser.parse(pa).isoformat()
+
 def normalize(jobs):
     out=[]
     for j in jobs:
@@ -14,7 +25,7 @@ def normalize(jobs):
         pa = j.get("posted_at")
         if isinstance(pa,str):
             try:
-                jj["posted_at"] = parser.parse(pa).isoformat()
+                jj["posted_at"] = _iso(pa)
             except Exception:
                 pass
         out.append(jj)